@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time the highly and largely composite number generators.
+
+    python benchmarks/bench_composite.py [--count 10000] [--largely 500]
+"""
+
+import argparse
+import itertools as it
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import integer  # noqa: E402
+
+
+def run(name, generator, count):
+    print("{:>10} {:>8} {:>8} {:>10}".format("sequence", "terms", "digits",
+                                             "seconds"))
+    start = time.perf_counter()
+    for i, n in enumerate(it.islice(generator(), count), 1):
+        if i & (i - 1) == 0 or i == count:
+            print("{:>10} {:>8} {:>8} {:>10.3f}".format(
+                name, i, len(str(n)), time.perf_counter() - start))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000,
+                        help="highly composite numbers to generate")
+    parser.add_argument("--largely", type=int, default=500,
+                        help="largely composite numbers to generate")
+    args = parser.parse_args()
+
+    run("highly", integer.highly_composite_numbers, args.count)
+    if args.largely:
+        print()
+        run("largely", integer.largely_composite_numbers, args.largely)
+
+
+if __name__ == "__main__":
+    main()
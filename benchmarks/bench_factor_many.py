@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time batch factorization: an Integer per number against factor_many.
+
+    python benchmarks/bench_factor_many.py [--count 200000] [--processes 4]
+
+The input mixes numbers below 10^12 with a share of 90-bit semiprimes, the
+hard composites that must not hold up a chunk of easy ones.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import integer  # noqa: E402
+import parallel  # noqa: E402
+
+
+def numbers(count, hard_share, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        if rng.random() < hard_share:
+            p = integer.next_prime(rng.getrandbits(45))
+            yield p * integer.next_prime(rng.getrandbits(45))
+        else:
+            yield rng.randrange(2, 10 ** 12)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--hard-share", type=float, default=0.001)
+    parser.add_argument("--processes", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    values = list(numbers(args.count, args.hard_share, args.seed))
+    runs = [("Integer loop", lambda: [integer.Integer(n).decomposition
+                                      for n in values]),
+            ("factor_many", lambda: list(integer.factor_many(
+                values, chunk_size=args.chunk_size)))]
+    for processes in args.processes:
+        runs.append(("{} processes".format(processes),
+                     lambda processes=processes: list(parallel.factor_many(
+                         values, processes, args.chunk_size))))
+
+    print("{:>14} {:>10} {:>14}".format("method", "seconds", "numbers/second"))
+    for name, run in runs:
+        integer.factorization_cache.clear()
+        integer.invariant_cache.clear()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print("{:>14} {:>10.2f} {:>14.0f}".format(name, elapsed,
+                                                  len(values) / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time the Goldbach range verifier over [4, 10^k) on 1, 2, 4, ... workers.
+
+    python benchmarks/bench_goldbach.py [--max-exponent 9] [--processes 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parallel  # noqa: E402
+
+# Minimal Goldbach prime records, https://oeis.org/A025019
+RECORDS = {6: (523, 503222), 7: (751, 3807404), 8: (1093, 60119912)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-exponent", type=int, default=9)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--memory-budget", type=int, default=1 << 28,
+                        help="bytes shared between the workers")
+    args = parser.parse_args()
+
+    workers = [1]
+    while workers[-1] * 2 <= args.processes:
+        workers.append(workers[-1] * 2)
+    print("{:>6} {:>8} {:>10} {:>12} {:>14}".format(
+        "n", "workers", "seconds", "n/second", "max p at"))
+    for k in range(6, args.max_exponent + 1):
+        for processes in workers:
+            start = time.perf_counter()
+            summary = parallel.verify_goldbach(
+                4, 10 ** k, processes=processes,
+                memory_budget=args.memory_budget)
+            elapsed = time.perf_counter() - start
+            assert not summary["counterexamples"], summary["counterexamples"]
+            if k in RECORDS:
+                assert (summary["max_prime"], summary["max_at"]) == \
+                    RECORDS[k], summary
+            print("{:>6} {:>8} {:>10.3f} {:>12.3g} {:>14}".format(
+                "10^{}".format(k), processes, elapsed, 10 ** k / elapsed,
+                "{} {}".format(summary["max_prime"], summary["max_at"])))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time IntegerRange against building an Integer per number.
+
+    python benchmarks/bench_integer_range.py [--stop 1000000] [--sample 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import integer  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=int, default=1)
+    parser.add_argument("--stop", type=int, default=1000000)
+    parser.add_argument("--sample", type=int, default=100000,
+                        help="numbers to time one Integer at a time")
+    parser.add_argument("--segment-size", type=int, default=1 << 16)
+    args = parser.parse_args()
+
+    columns = integer.IntegerRange.COLUMNS
+    start = time.perf_counter()
+    count = 0
+    for lo, hi, _ in integer.IntegerRange(
+            args.start, args.stop, args.segment_size).segments():
+        count += hi - lo
+    sieved = (time.perf_counter() - start) / max(count, 1)
+
+    sample = range(args.start, min(args.start + args.sample, args.stop))
+    integer.invariant_cache.clear()
+    start = time.perf_counter()
+    for n in sample:
+        z = integer.Integer(n)
+        for name in columns:
+            getattr(z, name)
+    single = (time.perf_counter() - start) / max(len(sample), 1)
+
+    print("{:>12} {:>14} {:>10}".format("method", "us per number", "numbers"))
+    print("{:>12} {:>14.2f} {:>10}".format("IntegerRange", 1e6 * sieved,
+                                           count))
+    print("{:>12} {:>14.2f} {:>10}".format("Integer", 1e6 * single,
+                                           len(sample)))
+
+
+if __name__ == "__main__":
+    main()
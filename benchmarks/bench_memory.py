@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Measure the bytes each Integer instance costs, against plain ints.
+
+    python benchmarks/bench_memory.py [--count 1000000] [--start 1000000]
+
+`dict-carrying` mimics the old layout, an int subclass holding a __dict__
+with a second copy of the value in `num`.
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import integer  # noqa: E402
+
+
+class DictCarrying(int):
+
+    def __init__(self, num):
+        self.num = int(num)
+
+
+def bytes_per_instance(make, count, start):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    values = [make(z) for z in range(start, start + count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Less the list's own pointer to each
+    return (after - before) / len(values) - 8, sys.getsizeof(values[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--start", type=int, default=1000000,
+                        help="first value, above the small int cache")
+    args = parser.parse_args()
+
+    print("{:>14} {:>16} {:>10}".format("layout", "traced bytes", "getsizeof"))
+    for name, make in (("int", int), ("dict-carrying", DictCarrying),
+                       ("Integer", integer.Integer)):
+        traced, size = bytes_per_instance(make, args.count, args.start)
+        print("{:>14} {:>16.1f} {:>10}".format(name, traced, size))
+
+
+if __name__ == "__main__":
+    main()
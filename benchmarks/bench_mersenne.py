@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time Integer.is_mersenne_prime on the known Mersenne prime exponents.
+
+    python benchmarks/bench_mersenne.py [--max-exponent 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import integer  # noqa: E402
+
+# https://oeis.org/A000043
+EXPONENTS = [2, 3, 5, 7, 13, 17, 19, 31, 61, 89, 107, 127, 521, 607, 1279,
+             2203, 2281, 3217, 4253, 4423, 9689, 9941, 11213, 19937, 21701,
+             23209, 44497]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-exponent", type=int, default=20000)
+    args = parser.parse_args()
+
+    print("{:>8} {:>10}".format("p", "seconds"))
+    total = 0.0
+    for p in EXPONENTS:
+        if p > args.max_exponent:
+            break
+        start = time.perf_counter()
+        assert integer.Integer((1 << p) - 1).is_mersenne_prime, p
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        print("{:>8} {:>10.3f}".format(p, elapsed))
+    print("{:>8} {:>10.3f}".format("total", total))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time prime_count and prime_sum at powers of ten up to 10^13.
+
+prime_count runs the Lagarias-Miller-Odlyzko method above its 2^20 table,
+prime_sum Lucy_Hedgehog's algorithm, which is why the sums stop earlier.
+
+    python benchmarks/bench_prime_count.py [--max-exponent 13]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import integer  # noqa: E402
+
+# pi(10^k), https://oeis.org/A006880
+KNOWN = {1: 4, 2: 25, 3: 168, 4: 1229, 5: 9592, 6: 78498, 7: 664579,
+         8: 5761455, 9: 50847534, 10: 455052511, 11: 4118054813,
+         12: 37607912018, 13: 346065536839, 14: 3204941750802,
+         15: 29844570422669}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-exponent", type=int, default=13)
+    parser.add_argument("--sums-up-to", type=int, default=11,
+                        help="largest exponent to time prime_sum at")
+    args = parser.parse_args()
+
+    print("{:>6} {:>18} {:>12} {:>12}".format(
+        "n", "pi(n)", "prime_count", "prime_sum"))
+    for k in range(1, args.max_exponent + 1):
+        start = time.perf_counter()
+        count = integer.prime_count(10 ** k)
+        counted = time.perf_counter() - start
+        assert count == KNOWN[k], (k, count)
+        summed = ""
+        if k <= args.sums_up_to:
+            start = time.perf_counter()
+            integer.prime_sum(10 ** k)
+            summed = "{:.3f}s".format(time.perf_counter() - start)
+        print("{:>6} {:>18} {:>11.3f}s {:>12}".format(
+            "10^{}".format(k), count, counted, summed))
+
+
+if __name__ == "__main__":
+    main()
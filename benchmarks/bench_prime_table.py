@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time a cold worker start with and without a memory-mapped prime table.
+
+    python benchmarks/bench_prime_table.py [--limit 100000000] [--path FILE]
+
+Each run is a fresh interpreter that imports `integer`, optionally loads the
+table, then generates the primes below --primes, counts pi at a few points
+up to --limit and tests the primality of a spread of numbers below it.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import primetable  # noqa: E402
+
+WORKER = """
+import sys
+sys.path.insert(0, {root!r})
+import itertools as it
+import integer
+import primetable
+if {path!r}:
+    primetable.load({path!r}, verify=False)
+count = sum(1 for _ in it.takewhile(lambda p: p < {primes},
+                                    integer.generate_primes()))
+pis = [integer.prime_count({limit} * k // 8) for k in range(1, 9)]
+tested = sum(integer.is_prime(n) for n in range(1, {limit}, {limit} // 50000))
+print(count, pis[-1], tested)
+"""
+
+
+def cold_start(path, args):
+    code = WORKER.format(root=ROOT, path=path, primes=args.primes,
+                         limit=args.limit)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code], check=True,
+                            capture_output=True, text=True).stdout
+    return time.perf_counter() - start, output.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=10 ** 8)
+    parser.add_argument("--primes", type=int, default=10 ** 7,
+                        help="bound of the primes each worker generates")
+    parser.add_argument("--path", help="table file to use or build")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.path or os.path.join(directory, "primes.bin")
+        if not os.path.exists(path):
+            start = time.perf_counter()
+            primetable.build(path, args.limit)
+            print("built {} ({} bytes) in {:.2f}s".format(
+                path, os.path.getsize(path), time.perf_counter() - start))
+
+        print("{:>10} {:>10}".format("table", "seconds"))
+        answers = set()
+        for name, table in (("without", ""), ("with", path)):
+            best = float("inf")
+            for _ in range(args.repeat):
+                elapsed, output = cold_start(table, args)
+                best = min(best, elapsed)
+                answers.add(tuple(output))
+            print("{:>10} {:>10.3f}".format(name, best))
+        assert len(answers) == 1, answers
+
+
+if __name__ == "__main__":
+    main()
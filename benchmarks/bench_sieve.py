@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time the parallel segmented sieve over 1, 2, 4 and 8 workers.
+
+    python benchmarks/bench_sieve.py [--hi 1000000000] [--workers 1 2 4 8]
+
+Each run counts and sums the primes below --hi segment by segment, as the
+nightly enumeration does; --primes also streams every prime back.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import integer  # noqa: E402
+import parallel  # noqa: E402
+
+# pi(10^k), https://oeis.org/A006880
+KNOWN = {10 ** 6: 78498, 10 ** 7: 664579, 10 ** 8: 5761455,
+         10 ** 9: 50847534, 10 ** 10: 455052511, 10 ** 11: 4118054813}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lo", type=int, default=0)
+    parser.add_argument("--hi", type=int, default=10 ** 9)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--segment-size", type=int, default=1 << 21)
+    parser.add_argument("--primes", action="store_true",
+                        help="stream the primes instead of counting them")
+    args = parser.parse_args()
+
+    print("cores: {}".format(os.cpu_count()))
+    print("{:>8} {:>14} {:>10} {:>16} {:>8}".format(
+        "workers", "primes", "seconds", "integers/second", "speedup"))
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        if args.primes:
+            count = sum(1 for _ in parallel.sieve_primes(
+                args.lo, args.hi, workers, args.segment_size))
+        elif workers == 1:
+            # No pool at all, the single-process reference
+            count = sum(c for _, _, (c, _) in integer.sieve_segments(
+                args.lo, args.hi, args.segment_size, summary=True))
+        else:
+            count = sum(c for _, _, (c, _) in parallel.sieve_segments(
+                args.lo, args.hi, workers, args.segment_size, summary=True))
+        elapsed = time.perf_counter() - start
+        if args.lo <= 2 and args.hi in KNOWN:
+            assert count == KNOWN[args.hi], count
+        baseline = baseline or elapsed
+        print("{:>8} {:>14} {:>10.2f} {:>16.3g} {:>8.2f}".format(
+            workers, count, elapsed, (args.hi - args.lo) / elapsed,
+            baseline / elapsed))
+
+
+if __name__ == "__main__":
+    main()
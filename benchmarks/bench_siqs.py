@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time the self-initialising quadratic sieve on balanced semiprimes of 50,
+60 and 70 digits, serially and on a process pool.
+
+    python benchmarks/bench_siqs.py [--processes N] [--digits 50 60 70]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import integer  # noqa: E402
+import parallel  # noqa: E402
+
+
+def random_prime(digits, rng):
+    while True:
+        candidate = rng.randrange(10 ** (digits - 1), 10 ** digits)
+        if integer.is_prime(candidate):
+            return candidate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--digits", type=int, nargs="+", default=[50, 60, 70])
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=2017)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print("{:>6} {:>12} {:>12}".format(
+        "digits", "1 process", "{} processes".format(args.processes)))
+    for digits in args.digits:
+        p = random_prime(digits // 2, rng)
+        q = random_prime(digits - digits // 2, rng)
+        timings = []
+        for run in (integer.siqs,
+                    lambda n: parallel.siqs(n, args.processes)):
+            start = time.perf_counter()
+            factor = run(p * q)
+            timings.append(time.perf_counter() - start)
+            assert factor in (p, q)
+        print("{:>6} {:>11.1f}s {:>11.1f}s".format(digits, *timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time the Mersenne, Woodall and Cullen prime generators.
+
+    python benchmarks/bench_special_primes.py [--terms 20 16 3] [--unsieved]
+
+Each family runs to its --terms-th prime (by default 2^4423 - 1,
+5312 * 2^5312 - 1 and 4713 * 2^4713 + 1). The presieved generator runs
+against one that tests every prime exponent or every index k, and with the
+tests spread over each count of --processes.
+"""
+
+import argparse
+import itertools as it
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import integer  # noqa: E402
+import parallel  # noqa: E402
+
+# family: generator, parallel generator, unsieved indices, number of index
+FAMILIES = {
+    "mersenne": (integer.mersenne_primes, parallel.mersenne_primes,
+                 integer.generate_primes, lambda p: (1 << p) - 1),
+    "woodall": (integer.woodall_primes, parallel.woodall_primes,
+                lambda: it.count(1), lambda k: (k << k) - 1),
+    "cullen": (integer.cullen_primes, parallel.cullen_primes,
+               lambda: it.count(1), lambda k: (k << k) + 1),
+}
+
+
+def timed(generator, terms):
+    start = time.perf_counter()
+    last = None
+    for last in it.islice(generator, terms):
+        pass
+    return time.perf_counter() - start, last.bit_length()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--terms", type=int, nargs=3, default=[20, 16, 3],
+                        metavar=("MERSENNE", "WOODALL", "CULLEN"))
+    parser.add_argument("--processes", type=int, nargs="*", default=[2, 4])
+    parser.add_argument("--unsieved", action="store_true",
+                        help="also time testing every candidate (slow)")
+    args = parser.parse_args()
+
+    print("cores: {}".format(os.cpu_count()))
+    print("{:>9} {:>16} {:>8} {:>10}".format("family", "method", "bits",
+                                             "seconds"))
+    for family, terms in zip(FAMILIES, args.terms):
+        generate, parallel_generate, indices, number = FAMILIES[family]
+        runs = [("presieved", generate)]
+        if args.unsieved:
+            runs.append(("unsieved", lambda: map(
+                number, integer._special_primes(family, indices()))))
+        for processes in args.processes:
+            runs.append(("{} processes".format(processes),
+                         lambda processes=processes: parallel_generate(
+                             processes)))
+        for name, run in runs:
+            elapsed, bits = timed(run(), terms)
+            print("{:>9} {:>16} {:>8} {:>10.2f}".format(family, name, bits,
+                                                        elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time factorize below a bound with and without the smallest prime factor
+table.
+
+    python benchmarks/bench_spf.py [--limit 100000000] [--count 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import integer  # noqa: E402
+
+
+def run(values):
+    integer.factorization_cache.clear()
+    start = time.perf_counter()
+    for n in values:
+        integer.factorize(n)
+    return (time.perf_counter() - start) / len(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=10 ** 8)
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    values = random.Random(args.seed).sample(range(2, args.limit),
+                                             args.count)
+    integer.set_spf_table_limit(0)
+    divided = run(values)
+    integer.set_spf_table_limit(args.limit, clock=time.perf_counter)
+    integer.factorize(2)  # build it outside the timing
+    stats = integer.spf_table_stats()
+    looked_up = run(values)
+    integer.set_spf_table_limit(0)
+
+    print("table: {} bytes for n < {}, {:.1f} bytes per entry, built in "
+          "{:.2f}s".format(stats["bytes"], stats["limit"],
+                           stats["bytes"] / stats["limit"],
+                           stats["build_seconds"]))
+    print("{:>10} {:>14}".format("method", "us per number"))
+    print("{:>10} {:>14.2f}".format("division", 1e6 * divided))
+    print("{:>10} {:>14.2f}".format("table", 1e6 * looked_up))
+
+
+if __name__ == "__main__":
+    main()
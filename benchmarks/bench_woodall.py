@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Compare Integer.is_woodall with the notebook's is_woodall and
+naive_is_woodall, and time the Woodall and Cullen primality tests.
+
+    python benchmarks/bench_woodall.py [--max-k 2000] [--repeat 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "woodall_notebook"))
+
+import integer  # noqa: E402
+import test_woodall  # noqa: E402
+
+
+def _time(function, values):
+    start = time.perf_counter()
+    for value in values:
+        function(value)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-k", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=200,
+                        help="inputs timed per size")
+    parser.add_argument("--notebook-bits", type=int, default=48,
+                        help="largest size the notebook's is_woodall, which "
+                             "loops up to the cube root, is timed at")
+    args = parser.parse_args()
+
+    recognisers = (("Integer.is_woodall",
+                    lambda z: integer.Integer(z).is_woodall),
+                   ("notebook is_woodall", test_woodall.is_woodall),
+                   ("naive_is_woodall", test_woodall.naive_is_woodall))
+    print("{:>8} ".format("bits") +
+          " ".join("{:>20}".format(name) for name, _ in recognisers))
+    k = 8
+    while k <= args.max_k:
+        # Half Woodall numbers, half their neighbours
+        values = [j * 2 ** j - 1 + random.choice((0, 0, 1, 2))
+                  for j in (random.randint(k // 2, k)
+                            for _ in range(args.repeat))]
+        row = ["{:>8}".format(k + k.bit_length())]
+        for name, recognise in recognisers:
+            if recognise is test_woodall.is_woodall and \
+                    k + k.bit_length() > args.notebook_bits:
+                row.append("{:>20}".format("-"))
+                continue
+            row.append("{:>19.4f}s".format(_time(recognise, values)))
+        print(" ".join(row))
+        k *= 2
+
+    print()
+    print("{:>8} {:>12} {:>12}".format("k", "Woodall", "Cullen"))
+    for k in (115, 123, 249, 362, 384, 462, 512, 751, 822, 1139, 1800):
+        if k > args.max_k:
+            break
+        woodall = integer.Integer(k * 2 ** k - 1)
+        cullen = integer.Integer(k * 2 ** k + 1)
+        print("{:>8} {:>11.4f}s {:>11.4f}s".format(
+            k, _time(lambda z: z.is_woodall_prime, [woodall]),
+            _time(lambda z: z.is_cullen_prime, [cullen])))
+
+
+if __name__ == "__main__":
+    main()
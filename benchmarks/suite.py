@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Time every Integer property and the module's functions from 10^2 to 10^18.
+
+    python benchmarks/suite.py [--max-exponent 18] [--output results.json]
+        [--baseline benchmarks/baseline.json] [--update-baseline]
+        [--only decomposition sigma ...]
+
+Each case runs at n near 10^k for k = 2, 3, ... up to its own cap, or until
+one call takes longer than --max-seconds. Every call starts from empty
+caches, so it measures the computation and not a lookup. Per case the
+suite fits two scaling exponents by least squares: alpha in t ~ n^alpha,
+for the sieves and the other algorithms polynomial in n, and beta in
+t ~ (log n)^beta, for those polynomial in the number of digits. Results
+go to a JSON file. Against a baseline from the same machine, any size
+more than --threshold times slower is reported as a regression, and the
+exit status is 1.
+"""
+
+import argparse
+import itertools as it
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import integer  # noqa: E402
+from integer import Integer  # noqa: E402
+
+# Integer properties and the largest exponent each is timed at
+PROPERTIES = {
+    "binary": 18, "decomposition": 18, "factorization": 18, "divisors": 18,
+    "tau": 18, "sigma": 18, "Omega": 18, "omega": 18, "radical": 18,
+    "mobius": 18, "is_squarefree": 18, "euler_totient": 18,
+    "carmichael": 18, "is_perfect": 18, "primality": 18, "parity": 18,
+    "nearest_prime": 18, "next_prime": 18, "prev_prime": 18,
+    "is_mersenne": 18, "is_mersenne_prime": 18, "is_woodall": 18,
+    "is_woodall_prime": 18, "is_cullen": 18, "is_cullen_prime": 18,
+    "pi": 12, "totatives": 6, "factorial": 5,
+}
+
+# name: (function of n, largest exponent, inputs); "random" inputs are
+# drawn from [10^k, 2 * 10^k), "even" ones too but even, "prime" ones are
+# the next prime after such a draw and "semiprime" ones the product of two
+# primes near its square root; "exact" ones are 10^k itself, for functions
+# of a bound or an index
+CASES = {
+    "goldbach_partitions": (lambda n: Integer(n).goldbach_partitions, 6,
+                            "even"),
+    "count_goldbach_partitions": (
+        lambda n: Integer(n).count_goldbach_partitions(), 7, "even"),
+    "minimal_goldbach_partition": (
+        lambda n: Integer(n).minimal_goldbach_partition(), 18, "even"),
+    "sigma_k(2)": (lambda n: Integer(n).sigma_k(2), 18, "random"),
+    "jordan_totient(2)": (lambda n: Integer(n).jordan_totient(2), 18,
+                          "random"),
+    "count_divisors": (lambda n: Integer(n).count_divisors(), 18, "random"),
+    "iter_divisors": (lambda n: sum(1 for _ in Integer(n).iter_divisors()),
+                      18, "random"),
+    "is_perfect_power(2)": (lambda n: Integer(n).is_perfect_power(2), 18,
+                            "random"),
+    "totative_mask": (lambda n: Integer(n).totative_mask(), 7, "random"),
+    "is_prime": (integer.is_prime, 18, "random"),
+    "is_prime(prime)": (integer.is_prime, 18, "prime"),
+    "factorize": (integer.factorize, 18, "random"),
+    "factorize(semiprime)": (integer.factorize, 18, "semiprime"),
+    "next_prime()": (integer.next_prime, 18, "random"),
+    "prime_count": (integer.prime_count, 12, "exact"),
+    "prime_sum": (integer.prime_sum, 10, "exact"),
+    "generate_primes": (
+        lambda n: sum(1 for _ in it.takewhile(lambda p: p < n,
+                                              integer.generate_primes())),
+        7, "exact"),
+    "sieve_segments": (
+        lambda n: sum(c for _, _, (c, _) in integer.sieve_segments(
+            0, n, summary=True)), 9, "exact"),
+    "factorial()": (integer.factorial, 5, "exact"),
+    "binomial(2n, n)": (lambda n: integer.binomial(2 * n, n), 5, "exact"),
+    "nth_most_divisors": (integer.nth_most_divisors, 4, "exact"),
+    "verify_goldbach": (lambda n: integer.verify_goldbach(4, n), 7,
+                        "exact"),
+    "IntegerRange": (lambda n: integer.IntegerRange(n, n + 10000).columns(),
+                     18, "exact"),
+}
+for _name, _cap in PROPERTIES.items():
+    CASES[_name] = (lambda n, name=_name: getattr(Integer(n), name), _cap,
+                    "random")
+del _name, _cap
+
+
+def inputs(kind, k, samples, rng):
+    if kind == "exact":
+        return [10 ** k]
+    values = [rng.randrange(10 ** k, 2 * 10 ** k) for _ in range(samples)]
+    if kind == "even":
+        return [v & ~1 for v in values]
+    if kind == "prime":
+        return [integer.next_prime(v) for v in values]
+    if kind == "semiprime":
+        return [integer.next_prime(integer._isqrt(v) >> 1) *
+                integer.next_prime(integer._isqrt(v) << 1) for v in values]
+    return values
+
+
+def clear_caches():
+    integer.factorization_cache.clear()
+    integer.invariant_cache.clear()
+
+
+def time_call(function, n, min_time):
+    """Median seconds of one call of `function(n)`, repeated on fresh
+    caches until `min_time` has passed
+    """
+    times = []
+    while not times or (sum(times) < min_time and len(times) < 100):
+        clear_caches()
+        start = time.perf_counter()
+        function(n)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def slope(xs, ys):
+    """Least squares slope of `ys` against `xs`, None under two points
+    """
+    if len(xs) < 2:
+        return None
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx
+
+
+def run_case(function, cap, kind, args, rng):
+    sizes, seconds = [], []
+    for k in range(2, min(cap, args.max_exponent) + 1):
+        values = inputs(kind, k, args.samples, rng)
+        per_call = sorted(time_call(function, n, args.min_time)
+                          for n in values)
+        median = per_call[len(per_call) // 2]
+        sizes.append(k)
+        seconds.append(median)
+        if median > args.max_seconds:
+            break
+    # Timings near the clock's resolution would only add noise to the fit
+    fitted = [(k, t) for k, t in zip(sizes, seconds) if t > 1e-6]
+    logs = [math.log(t) for _, t in fitted]
+    alpha = slope([k * math.log(10) for k, _ in fitted], logs)
+    beta = slope([math.log(k * math.log(10)) for k, _ in fitted], logs)
+    return {"exponents": sizes, "seconds": seconds, "alpha": alpha,
+            "beta": beta}
+
+
+def compare(results, baseline, threshold, noise):
+    """The (case, exponent, base seconds, seconds) more than `threshold`
+    times slower than `baseline`, ignoring differences under `noise`
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        before = dict(zip(base["exponents"], base["seconds"]))
+        for k, t in zip(result["exponents"], result["seconds"]):
+            if k in before and t > threshold * before[k] and \
+                    t - before[k] > noise:
+                regressions.append((name, k, before[k], t))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-exponent", type=int, default=18)
+    parser.add_argument("--max-seconds", type=float, default=1.0,
+                        help="stop growing a case once a call takes longer")
+    parser.add_argument("--min-time", type=float, default=0.02,
+                        help="seconds to repeat each input for")
+    parser.add_argument("--samples", type=int, default=3,
+                        help="random inputs per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", metavar="CASE")
+    parser.add_argument("--output", help="JSON file to write")
+    parser.add_argument("--baseline", help="JSON file to compare with")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the results to --baseline instead")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    parser.add_argument("--noise", type=float, default=1e-4,
+                        help="seconds below which differences are ignored")
+    args = parser.parse_args()
+
+    names = args.only or sorted(CASES)
+    unknown = set(names) - set(CASES)
+    if unknown:
+        parser.error("unknown cases: {}".format(", ".join(sorted(unknown))))
+
+    print("{:>28} {:>6} {:>12} {:>7} {:>7}".format(
+        "case", "max k", "seconds", "alpha", "beta"))
+    results = {}
+    for name in names:
+        function, cap, kind = CASES[name]
+        result = results[name] = run_case(function, cap, kind, args,
+                                          random.Random(args.seed))
+        print("{:>28} {:>6} {:>12.3g} {:>7} {:>7}".format(
+            name, result["exponents"][-1], result["seconds"][-1],
+            "-" if result["alpha"] is None else
+            "{:.2f}".format(result["alpha"]),
+            "-" if result["beta"] is None else
+            "{:.2f}".format(result["beta"])))
+    clear_caches()
+
+    report = {"python": platform.python_version(),
+              "machine": platform.machine(), "processor": platform.processor(),
+              "date": time.strftime("%Y-%m-%d"), "seed": args.seed,
+              "results": results}
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=1, sort_keys=True)
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as handle:
+            json.dump(report, handle, indent=1, sort_keys=True)
+    elif args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)["results"]
+        regressions = compare(results, baseline, args.threshold, args.noise)
+        for name, k, before, after in regressions:
+            print("REGRESSION {} at 10^{}: {:.3g}s -> {:.3g}s ({:.1f}x)"
+                  .format(name, k, before, after, after / before))
+        if regressions:
+            sys.exit(1)
+        print("no regressions against {}".format(args.baseline))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,322 @@
 # Ixnay the import statements!
 
 
+def _primes_up_to(limit):
+    """Plain sieve of Eratosthenes over a bytearray, used to build the small
+    prime tables at import time and the base primes of the segmented sieves.
+    Args:
+        limit (int): inclusive upper bound of the primes to return
+    Returns:
+        (list): the primes p such that 2 <= p <= `limit`, in ascending order
+    """
+    if limit < 2:
+        return []
+    flags = bytearray([1]) * (limit + 1)
+    flags[0] = flags[1] = 0
+    p = 2
+    while p * p <= limit:
+        if flags[p]:
+            flags[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+        p += 1
+    return [p for p in range(2, limit + 1) if flags[p]]
+
+
+_SMALL_PRIMES = tuple(_primes_up_to(1000))
+
+# Miller-Rabin with the first thirteen primes as bases is deterministic for
+# every n below this bound (Sorenson & Webster, 2015)
+_MILLER_RABIN_BOUND = 3317044064679887385961981
+_MILLER_RABIN_BASES = _SMALL_PRIMES[:13]
+
+# Event counts and per-property seconds of `instrumentation`, None while it
+# is off, so the hot paths pay one comparison each; see `Instrumentation`
+_counts = None
+_seconds = None
+_clock = None
+
+
+def _tally(name, k=1):
+    """Add `k` to the instrumentation counter `name`; only call it while
+    `_counts` is not None
+    """
+    _counts[name] = _counts.get(name, 0) + k
+
+
+def _isqrt(n):
+    """Integer square root by Newton's method, exact for integers of any size
+    (`n ** 0.5` loses precision past 2**53 and overflows past 1e308)
+    """
+    if n < 0:
+        raise ValueError("Square root is not defined for negative integers")
+    if n < 2:
+        return n
+    x = 1 << ((n.bit_length() + 1) >> 1)
+    while True:
+        y = (x + n // x) >> 1
+        if y >= x:
+            return x
+        x = y
+
+
+def _is_square(n):
+    """Whether `n` is a perfect square
+    """
+    if n < 0:
+        return False
+    r = _isqrt(n)
+    return r * r == n
+
+
+def _jacobi(a, n):
+    """Jacobi symbol (a/n) for odd positive `n`
+    """
+    a %= n
+    result = 1
+    while a:
+        while not a & 1:
+            a >>= 1
+            if n & 7 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a & 3 == 3 and n & 3 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _inverse(a, m):
+    """Inverse of `a` modulo `m` > 1 by the extended Euclidean algorithm
+    (three-argument `pow` only takes a negative exponent from Python 3.8);
+    raises ValueError, as that `pow` does, when gcd(a, m) != 1
+    """
+    a %= m
+    x, last_x, r, last_r = 1, 0, a, m
+    while r:
+        q = last_r // r
+        last_r, r = r, last_r - q * r
+        last_x, x = x, last_x - q * x
+    if last_r != 1:
+        raise ValueError("Base is not invertible for the given modulus")
+    return last_x % m
+
+
+def _is_strong_probable_prime(n, a):
+    """Miller-Rabin round: is odd `n` > 2 a strong probable prime to base `a`?
+    """
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def _is_strong_lucas_probable_prime(n):
+    """Strong Lucas probable prime test with Selfridge's parameters, the
+    second half of the Baillie-PSW test. `n` must be odd and not a square.
+    """
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    d, s = n + 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U * V % n, (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = (P * U + V) % n, (D * U + P * V) % n
+            if U & 1:
+                U += n
+            if V & 1:
+                V += n
+            U, V = (U >> 1) % n, (V >> 1) % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
 def is_prime(z):
-    """Takes an integer and returns whether that integer is prime. This
-    particular implementation from http://stackoverflow.com/a/27946768
+    """Takes an integer and returns whether that integer is prime. The test
+    is tiered: trial division by the primes below 1000, then Miller-Rabin
+    with a deterministic base set for z < 3.3e24, then the strong
+    Baillie-PSW test (no known counterexample) above that. Within the
+    bound of a table given to `use_prime_table`, it is looked up instead.
     Args:
-        z (int): Integer the primality of which to ascertain
+        z (int): Integer the primality of which to ascertain; an integral
+            float is taken as the integer it equals
     Returns:
         (bool): Whether `z` is prime
     """
+    if not isinstance(z, int):
+        if not isinstance(z, float):
+            raise TypeError("Primality is only defined for integers")
+        if not z.is_integer():
+            raise ValueError("Primality is only defined for integral values")
+        z = int(z)
+    if _counts is not None:
+        _tally("is_prime")
     if z <= 1:
         return False
-    for n in range(2, int(z ** 0.5 + 1)):
-        if not z % n:
-            return False
-    else:
+    if _prime_table is not None and z <= _prime_table.limit:
+        return _prime_table.is_prime(z)
+    for p in _SMALL_PRIMES:
+        if z % p == 0:
+            return z == p
+        if p * p > z:
+            return True
+    return _rough_prime_test(z)
+
+
+def _is_rough_prime(z):
+    """`is_prime` for z > 1000^2 without a prime factor below 1000, counted
+    as a primality test like `is_prime` itself
+    """
+    if _counts is not None:
+        _tally("is_prime")
+    return _rough_prime_test(z)
+
+
+def _rough_prime_test(z):
+    """The probable prime tests `is_prime` ends with, uncounted
+    """
+    if z < _MILLER_RABIN_BOUND:
+        return all(_is_strong_probable_prime(z, a)
+                   for a in _MILLER_RABIN_BASES)
+    return (_is_strong_probable_prime(z, 2) and not _is_square(z) and
+            _is_strong_lucas_probable_prime(z))
+
+
+def lucas_lehmer(p):
+    """The Lucas-Lehmer test: is the Mersenne number 2^p - 1 prime? Each
+    step reduces s^2 - 2 modulo M = 2^p - 1 by folding, since 2^p = 1 mod
+    M: x mod M is (x & M) + (x >> p), a shift and a mask instead of a
+    division.
+    Args:
+        p (int): exponent; 2^p - 1 can only be prime if `p` is prime
+    Returns:
+        (bool): whether 2^p - 1 is prime
+    """
+    if p == 2:
         return True
+    if not is_prime(p):
+        return False
+    mersenne = (1 << p) - 1
+    s = 4
+    for _ in range(p - 2):
+        # Adding M keeps the value non-negative when s < 2
+        s = s * s + mersenne - 2
+        s = (s & mersenne) + (s >> p)
+        s = (s & mersenne) + (s >> p)
+    return s == 0 or s == mersenne
+
+
+def _cullen_woodall_index(m):
+    """The k >= 1 with k * 2^k == `m`, or None. The bit length L of k * 2^k
+    is k + k.bit_length(), so k is L - b for b one of the two bit lengths
+    next to that of L, and at most two candidates need comparing.
+    """
+    if m < 2:
+        return None
+    size = m.bit_length()
+    for b in (size.bit_length() - 1, size.bit_length()):
+        k = size - b
+        if k >= 1 and k.bit_length() == b and k << k == m:
+            return k
+    return None
+
+
+def _split_power_of_two(k, n):
+    """Write k * 2^n as h * 2^m with h odd
+    """
+    shift = (k & -k).bit_length() - 1
+    return k >> shift, n + shift
+
+
+def _is_riesel_prime(h, n):
+    """The Lucas-Lehmer-Riesel test: is N = h * 2^n - 1 prime, for odd h <
+    2^n? The seed is V_h(P) mod N for the Lucas sequence V with Rodseth's
+    P, one with (P - 2 / N) = 1 and (P + 2 / N) = -1; N is prime if and
+    only if n - 2 squarings u -> u^2 - 2 then reach 0.
+    """
+    N = h * (1 << n) - 1
+    if N < _MILLER_RABIN_BOUND:
+        return is_prime(N)
+    P = 3
+    while not (_jacobi(P - 2, N) == 1 and _jacobi(P + 2, N) == -1):
+        if _jacobi(P - 2, N) == 0 or _jacobi(P + 2, N) == 0:
+            return False
+        P += 1
+    # V_h(P) by the ladder (V_j, V_j+1), V_2j = V_j^2 - 2,
+    # V_2j+1 = V_j V_j+1 - P
+    u, v = 2, P
+    for bit in bin(h)[2:]:
+        if bit == "1":
+            u, v = (u * v - P) % N, (v * v - 2) % N
+        else:
+            u, v = (u * u - 2) % N, (u * v - P) % N
+    for _ in range(n - 2):
+        u = (u * u - 2) % N
+    return u == 0
+
+
+def _is_proth_prime(h, n):
+    """Proth's theorem: N = h * 2^n + 1, odd h < 2^n, is prime if and only
+    if a^((N - 1)/2) = -1 mod N for any a with Jacobi symbol (a / N) = -1
+    """
+    N = h * (1 << n) + 1
+    if N < _MILLER_RABIN_BOUND:
+        return is_prime(N)
+    if _is_square(N):
+        return False
+    for a in _SMALL_PRIMES:
+        symbol = _jacobi(a, N)
+        if symbol == 0:
+            return False
+        if symbol == -1:
+            return pow(a, (N - 1) >> 1, N) == N - 1
+    return is_prime(N)
+
+
+# A table of primes consulted up to its bound, see `use_prime_table`
+_prime_table = None
+
+
+def use_prime_table(table):
+    """Have `is_prime`, `prime_count` and `generate_primes` answer from
+    `table` within its bound: any object with an int `limit` and methods
+    `is_prime(n)`, `pi(n)` and `primes(lo, hi)`, the primes in [lo, hi),
+    for 0 <= n <= limit and hi <= limit + 1, e.g. a memory-mapped
+    `primetable.PrimeTable`. None goes back to sieving
+    Returns:
+        the table used until now, or None
+    """
+    global _prime_table
+    previous, _prime_table = _prime_table, table
+    return previous
 
 
 def sequence():
@@ -32,16 +333,1994 @@ def sequence():
         n = sign * (abs(n) + 1)
 
 
-def generate_primes():
-    """ Sieve of Eratosthenes variation to generate primes
+def _sieve_segment(lo, hi, base_primes):
+    """Sieve the odd numbers of [`lo`, `hi`) by `base_primes`.
+    Args:
+        lo (int): inclusive lower bound of the segment
+        hi (int): exclusive upper bound of the segment
+        base_primes (list): the odd primes up to at least sqrt(hi - 1),
+            ascending
+    Returns:
+        (tuple): `first`, the smallest odd number >= `lo`, and a bytearray
+            `flags` where flags[i] is 1 if and only if first + 2*i is prime
+    """
+    first = lo | 1
+    size = (hi - first + 1) >> 1
+    if size <= 0:
+        return first, bytearray()
+    flags = bytearray([1]) * size
+    for p in base_primes:
+        square = p * p
+        if square >= hi:
+            break
+        start = square if square >= first else -(-first // p) * p
+        if not start & 1:
+            start += p
+        index = (start - first) >> 1
+        if index < size:
+            flags[index::p] = bytes(len(range(index, size, p)))
+    if first == 1:
+        flags[0] = 0
+    return first, flags
+
+
+def _segment_primes(lo, hi, base_primes):
+    """The primes in [`lo`, `hi`), ascending; `base_primes` as for
+    `_sieve_segment`
+    """
+    first, flags = _sieve_segment(lo, hi, base_primes)
+    primes = [first + 2 * i for i, flag in enumerate(flags) if flag]
+    return [2] + primes if lo <= 2 < hi else primes
+
+
+def _prime_window(lo, hi):
+    """The window [`lo`, `hi`) sieved by the primes below 1000, as the
+    ascending survivors and the test that picks the primes among them:
+    below 1000^2 every survivor is prime; above it survivors only need
+    the probable prime tests, which `_is_rough_prime` runs without
+    repeating trial division
+    """
+    bound = _SMALL_PRIMES[-1] ** 2
+    first, flags = _sieve_segment(lo, hi, _SMALL_PRIMES[1:])
+    candidates = [first + 2 * i for i, flag in enumerate(flags) if flag]
+    if lo <= 2 < hi:
+        candidates.insert(0, 2)
+    if hi <= bound:
+        return candidates, lambda z: True
+    return candidates, _is_rough_prime if lo > bound else is_prime
+
+
+def _prime_gap_window(n):
+    """A window width of about 6 ln n, a few expected prime gaps near `n`
+    """
+    return 4 * n.bit_length() + 64
+
+
+def next_prime(n):
+    """The smallest prime greater than `n`, searched in presieved windows
+    that start a few expected prime gaps wide and double until one holds
+    a prime
+    Args:
+        n (int): any integer
+    Returns:
+        (int)
+    """
+    if n < 2:
+        return 2
+    lo, width = n + 1, _prime_gap_window(n)
+    while True:
+        candidates, test = _prime_window(lo, lo + width)
+        for z in candidates:
+            if test(z):
+                return z
+        lo, width = lo + width, 2 * width
+
+
+def prev_prime(n):
+    """The largest prime less than `n`, searched as `next_prime` but
+    downwards
+    Args:
+        n (int): any integer
+    Returns:
+        (int): None if `n` <= 2
+    """
+    if n <= 2:
+        return None
+    hi, width = n, _prime_gap_window(n)
+    while hi > 2:
+        lo = max(hi - width, 2)
+        candidates, test = _prime_window(lo, hi)
+        for z in reversed(candidates):
+            if test(z):
+                return z
+        hi, width = lo, 2 * width
+
+
+def generate_primes(start=2, segment_size=1 << 16):
+    """ Segmented sieve of Eratosthenes generating the primes >= `start` in
+    ascending order, without end. Only odd numbers are stored, so memory is
+    bounded by `segment_size` / 2 bytes plus the primes up to the square root
+    of the current segment's upper bound. Segments within the bound of a
+    table given to `use_prime_table` are read from it instead.
+    Args:
+        start (int): lower bound (inclusive) of the primes to generate
+        segment_size (int): count of integers sieved per segment
+    Yields:
+        (int): the next prime
+    """
+    if segment_size < 2:
+        raise ValueError("Segment size must be at least 2")
+    if start <= 2:
+        yield 2
+    lo = max(start, 3)
+    base_limit, base_primes = 0, []
+    while True:
+        hi = lo + segment_size
+        table = _prime_table
+        if table is not None and hi <= table.limit + 1:
+            segment = table.primes(lo, hi)
+        else:
+            root = _isqrt(hi - 1)
+            if root > base_limit:
+                base_limit = max(root, 2 * base_limit)
+                base_primes = _primes_up_to(base_limit)[1:]
+            segment = _segment_primes(lo, hi, base_primes)
+        for prime in segment:
+            yield prime
+        lo = hi
+
+
+def _flag_index_sum(flags):
+    """The sum of the indices i with flags[i] == 1, bit by bit of i: the
+    flags whose index has bit b set are counted in C, either as 2^b
+    strided slices or as runs of 2^b, whichever there are fewer of
+    """
+    size, total, b = len(flags), 0, 0
+    while 1 << b < size:
+        width, step = 1 << b, 2 << b
+        if width <= size // step:
+            ones = sum(flags[r::step].count(1) for r in range(width, step))
+        else:
+            ones = sum(flags.count(1, start, start + width)
+                       for start in range(width, size, step))
+        total += ones << b
+        b += 1
+    return total
+
+
+# The odd primes of the last `_sieve_base_primes` call, reused by the
+# segments of one sieve (and, after a fork, by every worker)
+_sieve_base = (0, [])
+
+
+def _sieve_base_primes(limit):
+    """The odd primes up to at least `limit`, computed once per bound
+    """
+    global _sieve_base
+    if _sieve_base[0] < limit:
+        _sieve_base = (limit, _primes_up_to(limit)[1:])
+    return _sieve_base[1]
+
+
+def _sieve_task(task):
+    """Sieve one segment of `sieve_segments`: (lo, its primes) or, for a
+    summary, (lo, (count, sum))
+    """
+    lo, hi, root, summary = task
+    base_primes = _sieve_base_primes(root)
+    if not summary:
+        return lo, _segment_primes(lo, hi, base_primes)
+    first, flags = _sieve_segment(lo, hi, base_primes)
+    count = flags.count(1)
+    total = count * first + 2 * _flag_index_sum(flags)
+    if lo <= 2 < hi:
+        count, total = count + 1, total + 2
+    return lo, (count, total)
+
+
+def sieve_segments(lo, hi, segment_size=1 << 21, mapper=map,
+                   tasks_per_round=1, summary=False):
+    """Sieve [`lo`, `hi`) in segments that `mapper` may run in parallel
+    and in any order, handing them back in ascending order. Segments go
+    out `tasks_per_round` at a time and a round is sorted before it is
+    yielded, so at most one round of results is ever held.
+    Args:
+        lo (int): inclusive lower bound
+        hi (int): exclusive upper bound
+        segment_size (int): integers per segment; about half as many
+            bytes are sieved per segment
+        mapper (callable): `map`-like function running the segments, e.g.
+            a process pool's `imap_unordered` (see `parallel.sieve`)
+        tasks_per_round (int): segments handed to `mapper` at a time
+        summary (bool): give each segment's prime count and sum instead
+            of its primes
+    Yields:
+        (tuple): (segment lo, segment hi, list of primes) or, with
+            `summary`, (segment lo, segment hi, (count, sum))
+    """
+    if segment_size < 2:
+        raise ValueError("Segment size must be at least 2")
+    if tasks_per_round < 1:
+        raise ValueError("Tasks per round must be positive")
+    lo = max(lo, 0)
+    if lo >= hi:
+        return
+    root = _isqrt(hi - 1)
+    _sieve_base_primes(root)
+    starts = range(lo, hi, segment_size)
+    for i in range(0, len(starts), tasks_per_round):
+        tasks = [(start, min(start + segment_size, hi), root, summary)
+                 for start in starts[i:i + tasks_per_round]]
+        for start, result in sorted(mapper(_sieve_task, tasks),
+                                    key=lambda pair: pair[0]):
+            yield start, min(start + segment_size, hi), result
+
+
+def sieve_primes(lo, hi, segment_size=1 << 21, mapper=map,
+                 tasks_per_round=1):
+    """Generate the primes in [`lo`, `hi`) in ascending order, sieved by
+    `sieve_segments` with the same arguments
+    """
+    for _, _, primes in sieve_segments(lo, hi, segment_size, mapper,
+                                       tasks_per_round):
+        for p in primes:
+            yield p
+
+
+class _PrimeCountTable(object):
+    """pi(y) for every 0 <= y <= `limit`: an odd-only sieve with one byte
+    per odd number, plus the running prime count at every 64th odd number
+    so a lookup only counts the flags of one short slice.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        first, self.flags = _sieve_segment(
+            0, limit + 1, _primes_up_to(_isqrt(limit))[1:])
+        self.counts = [0]
+        count = 1  # the prime 2, which the odd-only flags leave out
+        for start in range(0, len(self.flags), 64):
+            self.counts.append(count)
+            count += self.flags.count(1, start, start + 64)
+        del self.counts[0]
+
+    def __call__(self, y):
+        if y < 3:
+            return 1 if y == 2 else 0
+        index = (y - 1) >> 1
+        return self.counts[index >> 6] + \
+            self.flags.count(1, index & ~63, index + 1)
+
+
+# pi(n) is read from a table for n up to this bound, see `set_pi_table_limit`
+_pi_table_limit = 1 << 20
+_pi_table = None
+# y = alpha n^(1/3) of the Lagarias-Miller-Odlyzko method, and the width of
+# the segments it sieves [0, n / y] in
+_LMO_ALPHA = 1
+_LMO_SEGMENT_SIZE = 1 << 18
+# phi(x, a) for a <= 6 is periodic modulo the primorial of the first a primes
+_PHI_TABLES = []
+for _a in range(1, 7):
+    _primorial = 1
+    for _p in _SMALL_PRIMES[:_a]:
+        _primorial *= _p
+    _table, _count = [0] * _primorial, 0
+    for _x in range(_primorial):
+        if all(_x % _p for _p in _SMALL_PRIMES[:_a]):
+            _count += 1
+        _table[_x] = _count
+    _PHI_TABLES.append((_primorial, _table))
+del _a, _p, _x, _primorial, _table, _count
+
+
+def set_pi_table_limit(limit):
+    """Set the bound below which `prime_count` answers from a precomputed
+    table (built on first use, about `limit` / 2 bytes)
+    """
+    global _pi_table_limit, _pi_table
+    _pi_table_limit, _pi_table = limit, None
+
+
+def _lucy_hedgehog(n, weighted=False):
+    """Lucy_Hedgehog's O(n^(3/4)) dynamic program for the number of primes
+    up to `n`, or their sum if `weighted`. S(v) is kept for the O(sqrt n)
+    values v = n // i only: `small[v]` for v <= sqrt(n) and `large[i]` for
+    S(n // i); sieving by each prime p updates S(v) -= p^w (S(v // p) -
+    S(p - 1)) for v >= p^2, one list comprehension per range.
+    """
+    r = _isqrt(n)
+    if weighted:
+        small = [v * (v + 1) // 2 - 1 for v in range(r + 1)]
+        large = [0] + [(n // i) * (n // i + 1) // 2 - 1
+                       for i in range(1, r + 1)]
+    else:
+        small = [v - 1 for v in range(r + 1)]
+        large = [0] + [n // i - 1 for i in range(1, r + 1)]
+    for p in range(2, r + 1):
+        if small[p] == small[p - 1]:
+            continue
+        sp, w, square = small[p - 1], p if weighted else 1, p * p
+        last = min(r, n // square)
+        middle = min(last, r // p)
+        large[1:middle + 1] = [large[i] - w * (large[i * p] - sp)
+                               for i in range(1, middle + 1)]
+        large[middle + 1:last + 1] = [
+            large[i] - w * (small[n // (i * p)] - sp)
+            for i in range(middle + 1, last + 1)]
+        if square <= r:
+            small[square:] = [small[v] - w * (small[v // p] - sp)
+                              for v in range(square, r + 1)]
+    return large[1]
+
+
+def _lagarias_miller_odlyzko(n):
+    """The Lagarias-Miller-Odlyzko method: pi(n) = phi(n, a) + a - 1 -
+    P2(n, a) with y = alpha n^(1/3) and a = pi(y). phi(n, a) is split
+    into ordinary leaves mu(m) phi(n / m, c), m <= y, read from the
+    primorial tables, and special leaves -mu(m) phi(n / (m p_b), b - 1),
+    m <= y < m p_b, whose arguments all lie below n / y. Those and the
+    pi(n / p), y < p <= sqrt(n), of P2 are answered by one segmented sieve
+    of [0, n / y], crossing off p_b after the queries of b are counted, so
+    memory stays within a segment plus O(y) tables.
+    """
+    y = max(min(_iroot(n, 3) * _LMO_ALPHA, _isqrt(n)), 2)
+    primes = _primes_up_to(y)
+    pi_y = _PrimeCountTable(y)
+    a, c = len(primes), min(len(primes), len(_PHI_TABLES))
+    lpf, mu = [0] * (y + 1), [1] * (y + 1)
+    for p in reversed(primes):
+        lpf[p::p] = [p] * len(range(p, y + 1, p))
+    for p in primes:
+        mu[p::p] = [-v for v in mu[p::p]]
+        mu[p * p::p * p] = [0] * len(range(p * p, y + 1, p * p))
+
+    # Ordinary leaves: m = 1 and the squarefree m <= y with lpf(m) > p_c
+    primorial, counts = _PHI_TABLES[c - 1]
+    total = counts[-1]
+    ordinary = 0
+    for m in range(1, y + 1):
+        if mu[m] and (m == 1 or lpf[m] > primes[c - 1]):
+            x = n // m
+            ordinary += mu[m] * ((x // primorial) * total +
+                                 counts[x % primorial])
+
+    # The special leaves of b walk their candidates m downwards, so their
+    # arguments n // (m p_b) come up in increasing order; above sqrt(y)
+    # only primes m > p_b are candidates
+    candidates, cursor, stop = [None] * (a + 1), [0] * (a + 1), [0] * (a + 1)
+    for b in range(c + 1, a + 1):
+        p = primes[b - 1]
+        if p * p <= y:
+            candidates[b] = range(y // p + 1, y + 1)
+        else:
+            candidates[b], stop[b] = primes, b
+        cursor[b] = len(candidates[b]) - 1
+
+    top = n // (y + 1) + 1
+    width = max(_LMO_SEGMENT_SIZE, 2 * _isqrt(top) + 2)
+    sqrt_n, odd_primes = _isqrt(n), primes[1:]
+    special = p2 = 0
+    b_max = a  # pi(sqrt n), counted up as P2 meets the primes above y
+    phi = [0] * (a + 1)  # phi(lo - 1, b - 1), for each b crossed so far
+    crossed = 1
+    pi_lo = 0  # pi(lo - 1)
+    for lo in range(0, top, width):
+        hi = min(lo + width, top)
+        size = (hi - lo) >> 1  # flags[i] stands for lo + 2i + 1
+        flags = bytearray([1]) * size
+        k = pi_y(min(_isqrt(hi - 1), y))
+        for b in range(crossed + 1, k + 1):
+            phi[b] = max(pi_lo - b + 2, 1) if lo else 0
+        crossed = max(crossed, k)
+        first = max(c + 1, pi_y(min(n // (hi * y), y)) + 1)
+        last = pi_y(min(_isqrt(n // lo), y)) if lo else a
+
+        ones = size
+        for b in range(2, k + 1):
+            p = primes[b - 1]
+            if first <= b <= last:
+                # flags hold phi(., b - 1) on the segment
+                ms, j = candidates[b], cursor[b]
+                count, position = phi[b], 0
+                while j >= stop[b]:
+                    m = ms[j]
+                    if mu[m] and lpf[m] > p:
+                        z = n // (m * p)
+                        if z >= hi:
+                            break
+                        index = (z - lo + 1) >> 1
+                        count += flags.count(1, position, index)
+                        position = index
+                        special -= mu[m] * count
+                    j -= 1
+                cursor[b] = j
+            phi[b] += ones
+            start = max(p, -(-lo // p) * p)
+            if not start & 1:
+                start += p
+            index = (start - lo - 1) >> 1
+            if index < size:
+                ones -= flags[index::p].count(1)
+                flags[index::p] = bytes(len(range(index, size, p)))
+
+        # Only 1 and the primes above p_k are left, so above y pi(z) is
+        # pi(lo - 1) plus the ones up to z, and p_1..p_k in the first
+        blocks = [0]
+        for i in range(0, size, 256):
+            blocks.append(blocks[-1] + flags.count(1, i, i + 256))
+        base = pi_lo + (max(k, 1) - 1 if not lo else 0)
+
+        def pi(z):
+            if z <= y:
+                return pi_y(z)
+            index = (z - lo + 1) >> 1
+            return base + blocks[index >> 8] + \
+                flags.count(1, index & ~255, index)
+
+        for b in range(max(first, k + 1), last + 1):
+            # p_b^2 >= hi, so phi(z, b - 1) = pi(z) - b + 2 for z >= p_b
+            p, ms, j = primes[b - 1], candidates[b], cursor[b]
+            while j >= stop[b]:
+                m = ms[j]
+                if mu[m] and lpf[m] > p:
+                    z = n // (m * p)
+                    if z >= hi:
+                        break
+                    special -= mu[m] * max(pi(z) - b + 2, 1)
+                j -= 1
+            cursor[b] = j
+
+        low = max(y, n // hi) + 1
+        high = min(sqrt_n, n // lo if lo else sqrt_n) + 1
+        for start in range(low, high, width):
+            for p in _segment_primes(start, min(start + width, high),
+                                     odd_primes):
+                p2 += pi(n // p)
+                b_max += 1
+        pi_lo = base + ones
+    p2 -= (b_max * (b_max - 1) - a * (a - 1)) // 2
+    return ordinary + special + a - 1 - p2
+
+
+def prime_count(n):
+    """The prime counting function pi(n), the number of primes <= `n`, in
+    sublinear time: a precomputed table below `set_pi_table_limit`'s bound
+    and the Lagarias-Miller-Odlyzko method beyond, which outruns
+    Lucy_Hedgehog's O(n^(3/4)) algorithm from 10^4 on. A table given to
+    `use_prime_table` answers first.
+    Args:
+        n (int): upper bound, inclusive
+    Returns:
+        (int)
+    """
+    global _pi_table
+    if n < 2:
+        return 0
+    if _prime_table is not None and n <= _prime_table.limit:
+        return _prime_table.pi(n)
+    if n <= _pi_table_limit:
+        if _pi_table is None:
+            _pi_table = _PrimeCountTable(_pi_table_limit)
+        return _pi_table(n)
+    return _lagarias_miller_odlyzko(n)
+
+
+def prime_sum(n):
+    """The sum of the primes <= `n`, by Lucy_Hedgehog's algorithm
+    Args:
+        n (int): upper bound, inclusive
+    Returns:
+        (int)
+    """
+    if n < 2:
+        return 0
+    return _lucy_hedgehog(n, weighted=True)
+
+
+_TRIAL_DIVISION_PRIMES = tuple(_primes_up_to(10000))
+
+# (B1, curves) schedule for the elliptic curve method, tuned for factors of
+# roughly 15, 20, 25, 30 and 35 digits; B2 is 50 * B1 at every level
+_ECM_SCHEDULE = ((2000, 25), (11000, 90), (50000, 300), (250000, 700),
+                 (1000000, 1800))
+
+
+def _gcd(a, b):
+    """Greatest common divisor of two non-negative integers
+    """
+    if _counts is not None:
+        _tally("gcd")
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def _iroot(n, k):
+    """Floor of the `k`-th root of non-negative `n`, exact for any size
+    """
+    if n < 2:
+        return n
+    x = 1 << -(-n.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def _perfect_power(n):
+    """Returns (base, exponent) with the largest exponent such that
+    base ** exponent == `n`, for `n` >= 2
+    """
+    for k in _primes_up_to(n.bit_length()):
+        root = _iroot(n, k)
+        if root ** k == n:
+            base, exponent = _perfect_power(root)
+            return base, exponent * k
+    return n, 1
+
+
+def _trial_divide(n, factors, primes=_TRIAL_DIVISION_PRIMES):
+    """Divide `primes` out of `n`, counting them into `factors`
+    Args:
+        n (int): positive integer to reduce
+        factors (dict): prime: exponent mapping, updated in place
+        primes (tuple): ascending primes to divide by
+    Returns:
+        (int): the cofactor of `n` free of `primes`; it is 1 or prime when
+            it is below the square of the largest of `primes`
+    """
+    for i, p in enumerate(primes):
+        if p * p > n:
+            break
+        if not n % p:
+            exponent = 0
+            while not n % p:
+                n //= p
+                exponent += 1
+            factors[p] = exponent
+    else:
+        if _counts is not None:
+            _tally("trial_divisions", len(primes))
+        return n
+    if _counts is not None:
+        # The i primes before the one that ended the loop were tried
+        _tally("trial_divisions", i)
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return 1
+
+
+def _pollard_brent(n, max_iterations=1 << 16):
+    """Brent's variant of Pollard's rho, batching the gcds in products of
+    128 differences. Another polynomial is tried only when a batch collapses
+    onto `n` itself.
+    Args:
+        n (int): odd composite to split
+        max_iterations (int): iteration budget per polynomial
+    Returns:
+        (int): a non-trivial factor of `n`, or None within the budget
+    """
+    m = 128
+    for c in (1, 3, 5, 7, 11):
+        y, r, q, g = 2, 1, 1, 1
+        x = ys = y
+        while g == 1 and r <= max_iterations:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * (x - y) % n
+                g = _gcd(q, n)
+                k += m
+            r <<= 1
+        if g == 1:
+            return None
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = _gcd((x - ys) % n, n)
+        if g < n:
+            return g
+    return None
+
+
+def _ecm_add(p, q, difference, n):
+    """Differential addition on a Montgomery curve in (X:Z) coordinates
+    """
+    u = (p[0] - p[1]) * (q[0] + q[1])
+    v = (p[0] + p[1]) * (q[0] - q[1])
+    return (difference[1] * (u + v) ** 2 % n,
+            difference[0] * (u - v) ** 2 % n)
+
+
+def _ecm_double(p, a24, n):
+    """Doubling on a Montgomery curve in (X:Z) coordinates
+    """
+    s = (p[0] + p[1]) ** 2 % n
+    d = (p[0] - p[1]) ** 2 % n
+    t = s - d
+    return s * d % n, t * (d + a24 * t) % n
+
+
+def _ecm_multiply(k, p, a24, n):
+    """Montgomery ladder computing k * `p`
+    """
+    r0, r1 = p, _ecm_double(p, a24, n)
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            r0, r1 = _ecm_add(r1, r0, p, n), _ecm_double(r1, a24, n)
+        else:
+            r0, r1 = _ecm_double(r0, a24, n), _ecm_add(r0, r1, p, n)
+    return r0
+
+
+def _ecm_stage_parameters(B1, B2):
+    """What every curve at one level of the schedule shares: the product of
+    the prime powers up to `B1`, the first prime above `B1` and the halved
+    gaps from it to each following prime up to `B2` (the first gap is 0)
+    """
+    k = 1
+    for p in _primes_up_to(B1):
+        power = p
+        while power * p <= B1:
+            power *= p
+        k *= power
+    primes = generate_primes(B1 + 1)
+    first = previous = next(primes)
+    gaps = bytearray([0])
+    for prime in primes:
+        if prime > B2:
+            break
+        gaps.append((prime - previous) >> 1)
+        previous = prime
+    return k, first, gaps
+
+
+def _ecm_curve(n, sigma, B1, B2, parameters=None):
+    """Run both stages of Lenstra's elliptic curve method on the Suyama
+    curve with parameter `sigma`.
+    Args:
+        n (int): odd composite to split
+        sigma (int): curve parameter, at least 6
+        B1 (int): stage 1 bound
+        B2 (int): stage 2 bound
+        parameters (tuple): `_ecm_stage_parameters(B1, B2)`, if computed
+    Returns:
+        (int): a non-trivial factor of `n`, or None
+    """
+    k, prime, gaps = parameters or _ecm_stage_parameters(B1, B2)
+    u, v = (sigma * sigma - 5) % n, 4 * sigma % n
+    try:
+        inverse = _inverse(16 * u ** 3 * v, n)
+    except ValueError:
+        g = _gcd(16 * u ** 3 * v % n, n)
+        return g if 1 < g < n else None
+    a24 = (v - u) ** 3 * (3 * u + v) * inverse % n
+    q = (u ** 3 % n, v ** 3 % n)
+
+    # Stage 1: multiply by every prime power up to B1
+    q = _ecm_multiply(k, q, a24, n)
+    g = _gcd(q[1], n)
+    if g == n:
+        return None
+    elif g > 1:
+        return g
+
+    # Stage 2: one prime in (B1, B2] at a time, stepping R = r*Q by 2D*Q
+    # and matching it against the precomputed S[d] = 2d*Q
+    D = _isqrt(B2) | 1
+    S = [None, _ecm_double(q, a24, n)]
+    S.append(_ecm_double(S[1], a24, n))
+    for d in range(3, D + 1):
+        S.append(_ecm_add(S[d - 1], S[1], S[d - 2], n))
+    beta = [None] + [s[0] * s[1] % n for s in S[1:]]
+
+    r = B1 - 1 if B1 & 1 == 0 else B1
+    T = _ecm_multiply(r - 2 * D, q, a24, n)
+    R = _ecm_multiply(r, q, a24, n)
+    x, z = R
+    alpha = x * z % n
+    g = 1
+    for gap in gaps:
+        prime += gap << 1
+        while prime > r + 2 * D:
+            R, T = _ecm_add(R, S[D], T, n), R
+            r += 2 * D
+            x, z = R
+            alpha = x * z % n
+        delta = (prime - r) >> 1
+        s = S[delta]
+        g = g * ((x - s[0]) * (z + s[1]) - alpha + beta[delta]) % n
+    g = _gcd(g, n)
+    return g if 1 < g < n else None
+
+
+def _ecm(n, schedule=_ECM_SCHEDULE):
+    """Lenstra's elliptic curve method with Montgomery's stage 2, working
+    through `schedule` until a curve splits `n`.
+    Returns:
+        (int): a non-trivial factor of `n`, or None once `schedule` is
+            exhausted
+    """
+    sigma = 6
+    for B1, curves in schedule:
+        parameters = _ecm_stage_parameters(B1, 50 * B1)
+        for _ in range(curves):
+            sigma += 1
+            factor = _ecm_curve(n, sigma, B1, 50 * B1, parameters)
+            if factor:
+                return factor
+    return None
+
+
+_LN2 = 0.6931471805599453
+
+
+def _log(x):
+    """Natural logarithm of a positive int or float, computed from the
+    binary exponent and an atanh series on the mantissa
+    """
+    if x <= 0:
+        raise ValueError("Logarithm is only defined for positive numbers")
+    exponent = 0
+    if isinstance(x, int):
+        exponent = x.bit_length() - 1
+        x = x / (1 << exponent)
+    while x >= 2:
+        x /= 2
+        exponent += 1
+    while x < 1:
+        x *= 2
+        exponent -= 1
+    if x > 1.4142135623730951:
+        x /= 2
+        exponent += 1
+    t = (x - 1) / (x + 1)
+    t2, term, total, k = t * t, t, 0.0, 1
+    while True:
+        step = term / k
+        if total + step == total:
+            break
+        total += step
+        term *= t2
+        k += 2
+    return exponent * _LN2 + 2 * total
+
+
+def _sqrt_mod_prime(a, p):
+    """Tonelli-Shanks: a square root of the quadratic residue `a` modulo the
+    odd prime `p`
+    """
+    a %= p
+    if a == 0:
+        return 0
+    if p % 4 == 3:
+        return pow(a, (p + 1) >> 2, p)
+    q, s = p - 1, 0
+    while not q & 1:
+        q >>= 1
+        s += 1
+    z = 2
+    while pow(z, (p - 1) >> 1, p) != p - 1:
+        z += 1
+    m, c, t, r = s, pow(z, q, p), pow(a, q, p), pow(a, (q + 1) >> 1, p)
+    while t != 1:
+        i, t2 = 0, t
+        while t2 != 1:
+            t2 = t2 * t2 % p
+            i += 1
+        b = pow(c, 1 << (m - i - 1), p)
+        m, c = i, b * b % p
+        t, r = t * c % p, r * b % p
+    return r
+
+
+# (digits, factor base size, sieve half-width) for the quadratic sieve, the
+# first row whose digit count is not exceeded applies
+_SIQS_PARAMETERS = ((30, 150, 16384), (36, 250, 16384), (40, 400, 32768),
+                    (44, 600, 32768), (48, 900, 65536), (52, 1300, 65536),
+                    (56, 1800, 98304), (60, 2600, 98304), (66, 4000, 131072),
+                    (72, 5500, 196608), (80, 8500, 262144),
+                    (90, 14000, 393216))
+_SIQS_MULTIPLIERS = (1, 3, 5, 7, 11, 13, 15, 17, 19, 21, 23, 29, 31, 33, 35,
+                     37, 39, 41, 43, 47)
+# Composite cofactors with at least this many digits go to the sieve
+_SIQS_MINIMUM_DIGITS = 30
+# Primes below this bound are not sieved, only trial divided
+_SIQS_SMALL_PRIME_BOUND = 32
+# bytes.translate tables adding k (saturating at 255) to every sieve byte
+_SIQS_ADD = tuple(bytes(min(b + k, 255) for b in range(256))
+                  for k in range(64))
+
+
+def _siqs_multiplier(n):
+    """Knuth-Schroeppel choice of the multiplier k making the factor base of
+    k * `n` as rich in small primes as possible
+    """
+    best, best_score = 1, None
+    for k in _SIQS_MULTIPLIERS:
+        kn = k * n
+        score = -0.5 * _log(k)
+        if kn % 8 == 1:
+            score += 2 * _LN2
+        elif kn % 8 == 5:
+            score += _LN2
+        elif kn % 4 == 3:
+            score += 0.5 * _LN2
+        for p in _SMALL_PRIMES[1:100]:
+            if not k % p:
+                score += _log(p) / p
+            elif _jacobi(kn, p) == 1:
+                score += 2 * _log(p) / (p - 1)
+        if best_score is None or score > best_score:
+            best, best_score = k, score
+    return best
+
+
+def _siqs_choose_a(context, seed):
+    """Indices in the factor base of the primes whose product is the leading
+    coefficient A of the next family of polynomials, picked pseudo-randomly
+    from `seed` so that A is close to sqrt(2kN) / M
+    """
+    primes, target, s, (lo, hi) = context[2], context[8], context[9], \
+        context[10]
+    state = seed * 6364136223846793005 + 1442695040888963407
+    chosen, a = [], 1
+    while len(chosen) < s - 1:
+        state = (state * 6364136223846793005 + 1442695040888963407) % 2**64
+        index = lo + (state >> 33) % (hi - lo)
+        if index not in chosen:
+            chosen.append(index)
+            a *= primes[index]
+    wanted = target // a
+    best = None
+    for index in range(context[5], len(primes)):
+        if index in chosen:
+            continue
+        if best is None or \
+                abs(primes[index] - wanted) < abs(primes[best] - wanted):
+            best = index
+    chosen.append(best)
+    return chosen
+
+
+def _siqs_sieve(task):
+    """Sieve every polynomial of one SIQS family, i.e. every choice of B
+    for one leading coefficient A, visiting the B values in Gray code order.
+    Args:
+        task (tuple): (context, seed) where `context` is the tuple built by
+            `siqs` and `seed` selects A
+    Returns:
+        (tuple): lists of full relations (u, {p: e}) and of partial
+            relations (u, {p: e}, large prime), where u**2 is congruent to
+            the product of p**e (times the large prime) modulo kN
+    """
+    context, seed = task
+    kn, M, primes, roots, logs, sieve_from, threshold, large_bound = \
+        context[:8]
+    a_indices = _siqs_choose_a(context, seed)
+    a_set = set(a_indices)
+    a_primes = [primes[i] for i in a_indices]
+    A = 1
+    for q in a_primes:
+        A *= q
+    s = len(a_indices)
+    B_terms = []
+    for i in a_indices:
+        q = primes[i]
+        a_q = A // q
+        gamma = roots[i] * _inverse(a_q, q) % q
+        if gamma > q >> 1:
+            gamma = q - gamma
+        B_terms.append(a_q * gamma)
+    B = sum(B_terms)
+
+    F = len(primes)
+    active = [j for j in range(sieve_from, F) if j not in a_set]
+    solution1, solution2 = [0] * F, [0] * F
+    steps = [[0] * F for _ in range(s)]
+    for j in active:
+        p = primes[j]
+        a_inverse = _inverse(A, p)
+        solution1[j] = (a_inverse * (roots[j] - B) + M) % p
+        solution2[j] = (a_inverse * (-roots[j] - B) + M) % p
+        for v in range(s):
+            steps[v][j] = 2 * B_terms[v] * a_inverse % p
+    trial = [j for j in range(F) if j < sieve_from or j in a_set]
+    above = bytes(1 if b >= threshold else 0 for b in range(256))
+
+    relations, partials = [], []
+    signs = [1] * s
+    for i in range(1 << (s - 1)):
+        if i:
+            v = (i & -i).bit_length()
+            e = signs[v]
+            signs[v] = -e
+            B -= 2 * e * B_terms[v]
+            step = steps[v]
+            for j in active:
+                p = primes[j]
+                solution1[j] = (solution1[j] + e * step[j]) % p
+                solution2[j] = (solution2[j] + e * step[j]) % p
+
+        sieve = bytearray(2 * M)
+        for j in active:
+            p, table = primes[j], _SIQS_ADD[logs[j]]
+            r = solution1[j]
+            sieve[r::p] = sieve[r::p].translate(table)
+            r = solution2[j]
+            if r != solution1[j]:
+                sieve[r::p] = sieve[r::p].translate(table)
+
+        C = (B * B - kn) // A
+        hits = sieve.translate(above)
+        index = hits.find(1)
+        while index != -1:
+            x = index - M
+            value = (A * x + 2 * B) * x + C
+            factors = {q: 1 for q in a_primes}
+            if value < 0:
+                factors[-1] = 1
+                value = -value
+            for j in trial:
+                p = primes[j]
+                while not value % p:
+                    value //= p
+                    factors[p] = factors.get(p, 0) + 1
+            for j in active:
+                p = primes[j]
+                residue = index % p
+                if residue == solution1[j] or residue == solution2[j]:
+                    while not value % p:
+                        value //= p
+                        factors[p] = factors.get(p, 0) + 1
+            if value == 1:
+                relations.append((A * x + B, factors))
+            elif value < large_bound:
+                partials.append((A * x + B, factors, value))
+            index = hits.find(1, index + 1)
+    return relations, partials
+
+
+def _gf2_dependencies(columns, count):
+    """Linear dependencies among `count` rows of a matrix over GF(2) stored
+    as `columns`, one Python int per column with bit i for row i, by the
+    structured elimination of Koc and Arachchige.
+    Yields:
+        (list): row indices whose rows sum to zero
+    """
+    columns = list(columns)
+    pivots = {}
+    for j, column in enumerate(columns):
+        if not column:
+            continue
+        low = column & -column
+        pivots[j] = low.bit_length() - 1
+        for k in range(len(columns)):
+            if k != j and columns[k] & low:
+                columns[k] ^= column
+    marked = set(pivots.values())
+    for i in range(count):
+        if i in marked:
+            continue
+        bit = 1 << i
+        yield [i] + [pivots[j] for j in pivots if columns[j] & bit]
+
+
+def siqs(n, mapper=map, tasks_per_round=1):
+    """Self-initialising quadratic sieve: returns a non-trivial factor of
+    the composite `n`. Relations are collected with the large prime
+    variation and combined by Gaussian elimination over GF(2) on packed ints.
+    Args:
+        n (int): composite integer, not a prime power
+        mapper (callable): `map`-like function used to run the sieving
+            tasks; passing a process pool's `imap_unordered` spreads the
+            sieving over several cores
+        tasks_per_round (int): families of polynomials handed to `mapper`
+            at a time; the process count of a pool is a sensible choice
+    Returns:
+        (int): a factor d of `n` with 1 < d < `n`
+    """
+    if tasks_per_round < 1:
+        raise ValueError("Tasks per round must be positive")
+    if n < 4 or is_prime(n):
+        raise ValueError("SIQS needs a composite integer")
+    if not n & 1:
+        return 2
+    base, exponent = _perfect_power(n)
+    if exponent > 1:
+        return base
+
+    digits = len(str(n))
+    for row in _SIQS_PARAMETERS:
+        if digits <= row[0]:
+            break
+    size, M = row[1], row[2]
+
+    k = _siqs_multiplier(n)
+    kn = k * n
+    primes, roots, logs = [], [], []
+    for p in generate_primes():
+        if len(primes) >= size:
+            break
+        if not n % p:
+            return p
+        if p == 2 or not k % p or _jacobi(kn, p) != 1:
+            continue
+        primes.append(p)
+        roots.append(_sqrt_mod_prime(kn, p))
+        logs.append((p * p).bit_length() >> 1)
+    primes.insert(0, 2)
+    roots.insert(0, 1)
+    logs.insert(0, 1)
+    sieve_from = 0
+    while primes[sieve_from] < _SIQS_SMALL_PRIME_BOUND:
+        sieve_from += 1
+
+    largest = primes[-1]
+    large_bound = largest * min(largest, 128)
+    target = _isqrt(2 * kn) // M
+    # A is a product of s primes from a window around target ** (1 / s),
+    # with s the smallest count keeping those primes well inside the base
+    s, ceiling = 1, min(2000, largest // 2)
+    while ceiling ** s < target:
+        s += 1
+    q = int(2.718281828459045 ** (_log(target) / s))
+    lo = sieve_from
+    while lo < len(primes) - 1 and primes[lo] < q // 2:
+        lo += 1
+    hi = lo
+    while hi < len(primes) and primes[hi] < 2 * q:
+        hi += 1
+    while hi - lo < 20 + 2 * s and (lo > sieve_from or hi < len(primes)):
+        lo, hi = max(sieve_from, lo - 1), min(len(primes), hi + 1)
+    threshold = max(1, (M * _isqrt(kn)).bit_length() -
+                    large_bound.bit_length() - 4)
+    context = (kn, M, primes, roots, logs, sieve_from, threshold,
+               large_bound, target, s, (lo, hi))
+
+    relations, partials = {}, {}
+    needed = len(primes) + 20
+    seed = 0
+    while True:
+        tasks = [(context, seed + i) for i in range(tasks_per_round)]
+        seed += tasks_per_round
+        for full, partial in mapper(_siqs_sieve, tasks):
+            for u, factors in full:
+                relations[u] = factors
+            for u, factors, large in partial:
+                if large not in partials:
+                    partials[large] = (u, factors)
+                    continue
+                other, other_factors = partials[large]
+                if other == u:
+                    continue
+                g = _gcd(large, n)
+                if 1 < g < n:
+                    return g
+                combined = dict(other_factors)
+                for p, e in factors.items():
+                    combined[p] = combined.get(p, 0) + e
+                combined[large] = 2
+                relations[u * other] = combined
+        if len(relations) < needed:
+            continue
+        factor = _siqs_square_root(n, list(relations.items()))
+        if factor:
+            return factor
+        needed += 10
+
+
+def _siqs_square_root(n, relations):
+    """Combine `relations` into congruent squares X**2 = Y**2 (mod n) and
+    return a non-trivial gcd(X - Y, n), or None
+    """
+    columns = {}
+    for i, (_, factors) in enumerate(relations):
+        for p, e in factors.items():
+            if e & 1:
+                columns[p] = columns.get(p, 0) | 1 << i
+    for dependency in _gf2_dependencies(columns.values(), len(relations)):
+        x, exponents = 1, {}
+        for i in dependency:
+            u, factors = relations[i]
+            x = x * u % n
+            for p, e in factors.items():
+                exponents[p] = exponents.get(p, 0) + e
+        y = 1
+        for p, e in exponents.items():
+            if p > 0:
+                y = y * pow(p, e >> 1, n) % n
+        g = _gcd(abs(x - y), n)
+        if 1 < g < n:
+            return g
+    return None
+
+
+def _split(n, mapper=map, tasks_per_round=1):
+    """A non-trivial factor of the composite `n`, which has no prime
+    factors below the trial division bound. Cofactors of 30 digits or more
+    get a few levels of ECM, growing with their size, before the quadratic
+    sieve takes over; `mapper` and `tasks_per_round` are passed to `siqs`
+    """
+    if _counts is not None:
+        _tally("factorize.rho")
+    factor = _pollard_brent(n)
+    if factor:
+        return factor
+    digits = len(str(n))
+    if _counts is not None:
+        _tally("factorize.ecm")
+    if digits < _SIQS_MINIMUM_DIGITS:
+        return _ecm(n)
+    levels = max(0, (digits - 35) // 10)
+    factor = _ecm(n, _ECM_SCHEDULE[:levels])
+    if factor:
+        return factor
+    if _counts is not None:
+        _tally("factorize.siqs")
+    return siqs(n, mapper=mapper, tasks_per_round=tasks_per_round)
+
+
+class LRUCache(object):
+    """A bounded mapping that evicts its least recently used entry once it
+    holds `maxsize` entries, counting hits, misses and evictions. Recency
+    is the insertion order of a plain dict: a hit moves its key to the end.
+    """
+
+    def __init__(self, maxsize=1 << 16):
+        if maxsize < 1:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        self._data = {}
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """The value cached for `key`, marking it most recently used, or
+        `default` (counted as a miss)
+        """
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Cache `value` for `key`, evicting the least recently used entries
+        beyond `maxsize`
+        """
+        self._data.pop(key, None)
+        self._data[key] = value
+        while len(self._data) > self.maxsize:
+            self._evict()
+
+    def resize(self, maxsize):
+        """Change the bound, evicting entries if it shrinks
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        while len(self._data) > self.maxsize:
+            self._evict()
+
+    def _evict(self):
+        """Drop the least recently used entry and return its value
+        """
+        self.evictions += 1
+        return self._data.pop(next(iter(self._data)))
+
+    def clear(self):
+        """Drop every entry and reset the counters
+        """
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Snapshot of the counters and occupancy
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "size": len(self._data),
+                "maxsize": self.maxsize}
+
+
+class FactorizationCache(LRUCache):
+    """`LRUCache` of {prime: exponent} dictionaries keyed by the absolute
+    value factored, shared by every `Integer`. Besides exact lookups it can
+    recover the part of a number made of primes it has seen before, so
+    factoring a * k with a cached only leaves k to factor. The cached primes
+    above the trial division bound are counted in `_primes`, so that takes
+    one division per such prime rather than a gcd per entry.
+    """
+
+    def __init__(self, maxsize=1 << 16):
+        super(FactorizationCache, self).__init__(maxsize)
+        self.partial_hits = 0
+        self._primes = {}
+
+    def _index(self, factors):
+        for p in factors:
+            if p > _TRIAL_DIVISION_PRIMES[-1]:
+                self._primes[p] = self._primes.get(p, 0) + 1
+
+    def _unindex(self, factors):
+        for p in factors:
+            if p in self._primes:
+                self._primes[p] -= 1
+                if not self._primes[p]:
+                    del self._primes[p]
+
+    def put(self, key, value):
+        if key in self._data:
+            self._unindex(self._data[key])
+        self._index(value)
+        super(FactorizationCache, self).put(key, value)
+
+    def _evict(self):
+        factors = super(FactorizationCache, self)._evict()
+        self._unindex(factors)
+        return factors
+
+    def known_divisor(self, n):
+        """Returns (d, {prime: exponent} of d) for the largest divisor d > 1
+        of `n` whose primes all divide a cached number and exceed the trial
+        division bound, or None
+        """
+        primes = [p for p in self._primes if not n % p]
+        if not primes:
+            return None
+        self.partial_hits += 1
+        d, factors = 1, {}
+        for p in sorted(primes):
+            exponent = 0
+            while not n % (d * p):
+                d *= p
+                exponent += 1
+            factors[p] = exponent
+        return d, factors
+
+    def clear(self):
+        super(FactorizationCache, self).clear()
+        self.partial_hits = 0
+        self._primes.clear()
+
+    def stats(self):
+        stats = super(FactorizationCache, self).stats()
+        stats["partial_hits"] = self.partial_hits
+        return stats
+
+
+factorization_cache = FactorizationCache()
+# Composite cofactors above this size are worth a division by each cached
+# prime before rho, ECM or the sieve get to them
+_CACHE_SCAN_BITS = 80
+
+
+class _SmallestPrimeFactorTable(object):
+    """The smallest prime factor of every n < `limit`, for factoring by
+    O(log n) lookups. Only odd n are stored, each as the 1-based index of
+    its least prime among the odd primes up to sqrt(limit), or 0 if n is
+    prime: 16 bits each, one byte per integer covered, as long as there
+    are fewer than 2^16 such primes (limit below about 6.7 * 10^11), 32
+    bits beyond. It is sieved by those primes in descending order, each
+    writing its index over its odd multiples from p^2 on as one slice
+    assignment, so the smallest one is written last.
+    """
+
+    def __init__(self, limit, clock=None):
+        started = clock() if clock else None
+        self.limit = limit
+        self.primes = _primes_up_to(_isqrt(max(limit - 1, 0)))[1:]
+        form = "H" if len(self.primes) < 1 << 16 else "I"
+        size = limit >> 1
+        cell = memoryview(bytearray(4)).cast(form)[:1]
+        self.table = memoryview(bytearray(cell.nbytes * size)).cast(form)
+        for k in range(len(self.primes), 0, -1):
+            p = self.primes[k - 1]
+            cell[0] = k
+            start = (p * p) >> 1
+            self.table[start::p] = memoryview(
+                cell.tobytes() * len(range(start, size, p))).cast(form)
+        self.build_seconds = clock() - started if clock else None
+
+    @property
+    def nbytes(self):
+        """Bytes taken by the table proper
+        """
+        return self.table.nbytes
+
+    def factorize(self, n):
+        """{prime: exponent} of 1 < `n` < `limit`, ascending
+        """
+        factors = {}
+        twos = (n & -n).bit_length() - 1
+        if twos:
+            factors[2] = twos
+            n >>= twos
+        while n > 1:
+            k = self.table[n >> 1]
+            p = self.primes[k - 1] if k else n
+            exponent = 0
+            while not n % p:
+                n //= p
+                exponent += 1
+            factors[p] = exponent
+        return factors
+
+
+# `factorize` reads smallest prime factors from a table for n below this
+# bound, see `set_spf_table_limit`; 0 leaves it off
+_spf_table_limit = 0
+_spf_table = None
+_spf_clock = None
+
+
+def set_spf_table_limit(limit, clock=None):
+    """Set the bound below which `factorize`, and so every Integer
+    invariant, reads smallest prime factors from a precomputed table
+    instead of dividing: built on first use, about `limit` bytes; 0 turns
+    it off and frees it. See `spf_table_stats`
+    Args:
+        limit (int): exclusive bound of the table
+        clock (callable): returns seconds, e.g. `time.perf_counter`, to
+            time the build with
+    """
+    global _spf_table_limit, _spf_table, _spf_clock
+    _spf_table_limit, _spf_table, _spf_clock = max(limit, 0), None, clock
+
+
+def spf_table_stats():
+    """The bound of the smallest prime factor table, whether it is built
+    yet, the bytes it takes and how long the build took (None without a
+    clock)
+    """
+    table = _spf_table
+    return {"limit": _spf_table_limit, "built": table is not None,
+            "bytes": table.nbytes if table else 0,
+            "build_seconds": table.build_seconds if table else None}
+
+
+def factorize(n, mapper=map, tasks_per_round=1):
+    """The prime decomposition of |`n`| as a dictionary of "prime: power",
+    in ascending order of primes and computed in exact integer arithmetic.
+    Small primes are removed by trial division; each composite cofactor is
+    then split by Pollard-Brent rho and, failing that, by the elliptic
+    curve method or, from 30 digits on, the self-initialising quadratic
+    sieve, until every piece passes `is_prime`. Results that left such a
+    cofactor are kept in the shared `factorization_cache`, which also
+    supplies any divisor a composite cofactor has in common with a number
+    factored before; the rest are cheaper to redo than to cache. Below
+    `set_spf_table_limit`'s bound it reads a smallest prime factor table
+    instead.
+    Args:
+        n (int): integer to factor
+        mapper (callable): `map`-like function running the sieving tasks
+            of `siqs`, e.g. a process pool's `imap_unordered`
+        tasks_per_round (int): sieving tasks handed to `mapper` at a time
+    Returns:
+        (dict): {prime: exponent}; empty for 0 and +-1
+    """
+    global _spf_table
+    n = abs(int(n))
+    if _counts is not None:
+        _tally("factorize")
+    if n < 2:
+        return {}
+    if n < _spf_table_limit:
+        if _counts is not None:
+            _tally("factorize.spf_table")
+        if _spf_table is None:
+            _spf_table = _SmallestPrimeFactorTable(_spf_table_limit,
+                                                   _spf_clock)
+        return _spf_table.factorize(n)
+    cached = factorization_cache.get(n)
+    if cached is not None:
+        if _counts is not None:
+            _tally("factorize.cached")
+        return dict(cached)
+    factors = {}
+    stack = [(_trial_divide(n, factors), 1)]
+    composite = False
+    while stack:
+        m, multiplicity = stack.pop()
+        if m == 1:
+            continue
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + multiplicity
+            continue
+        composite = True
+        known = factorization_cache.get(m) if m in factorization_cache \
+            else None
+        if known is None and m.bit_length() > _CACHE_SCAN_BITS:
+            divisor = factorization_cache.known_divisor(m)
+            if divisor is not None:
+                if _counts is not None:
+                    _tally("factorize.known_divisor")
+                d, known = divisor
+                stack.append((m // d, multiplicity))
+        elif known is not None and _counts is not None:
+            _tally("factorize.cached")
+        if known is not None:
+            for p, e in known.items():
+                factors[p] = factors.get(p, 0) + e * multiplicity
+            continue
+        base, exponent = _perfect_power(m)
+        if exponent > 1:
+            if _counts is not None:
+                _tally("factorize.perfect_power")
+            stack.append((base, multiplicity * exponent))
+            continue
+        d = _split(m, mapper, tasks_per_round)
+        if d is None:
+            raise ArithmeticError("Could not factor {}".format(m))
+        stack.append((d, multiplicity))
+        stack.append((m // d, multiplicity))
+    factors = {p: factors[p] for p in sorted(factors)}
+    if composite:
+        factorization_cache.put(n, factors)
+    return dict(factors)
+
+
+def _factor_tasks(values, chunk_size=256, hard_bits=64):
+    """Group `values` into the tasks of `factor_many`, lazily: lists of
+    (index, n), numbers of up to `hard_bits` bits `chunk_size` to a list,
+    and each bigger one, which may take long, in a list of its own. The
+    chunk so far goes out ahead of it, so tasks come in index order.
+    """
+    chunk = []
+    for i, n in enumerate(values):
+        if n.bit_length() > hard_bits:
+            if chunk:
+                yield chunk
+                chunk = []
+            yield [(i, n)]
+            continue
+        chunk.append((i, n))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _factor_task(task):
+    """Factor the (index, n) of one task of `factor_many`
+    """
+    return [(i, n, factorize(n) if n > 1 else {}) for i, n in task]
+
+
+def _in_order(results):
+    """Reorder the (index, n, factors) lists of `_factor_task`, in any
+    order, into (n, factors) by index, holding only the early arrivals
+    """
+    waiting, expected = {}, 0
+    for result in results:
+        for i, n, factors in result:
+            waiting[i] = n, factors
+        while expected in waiting:
+            yield waiting.pop(expected)
+            expected += 1
+
+
+def factor_many(values, mapper=map, chunk_size=256, hard_bits=64,
+                ordered=True):
+    """Factor every integer of `values`, lazily, as `Integer(n).decomposition`
+    would: numbers of up to `hard_bits` bits go to `mapper` in chunks of
+    `chunk_size`, to amortise the cost of each task, and bigger ones one
+    per task, so that a hard composite holds up nothing but itself.
+    Args:
+        values (iterable): the integers, consumed as results are taken
+        mapper (callable): `map`-like function running the tasks, e.g. a
+            process pool's `imap_unordered` (see `parallel.factor_many`,
+            which also bounds the tasks in flight)
+        chunk_size (int): numbers per task below `hard_bits`
+        hard_bits (int): size above which a number is a task of its own
+        ordered (bool): yield in the order of `values` rather than that in
+            which `mapper` finishes
+    Yields:
+        (tuple): (n, {prime: exponent}), {} for n < 2
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+    results = mapper(_factor_task, _factor_tasks(values, chunk_size,
+                                                 hard_bits))
+    if ordered:
+        for pair in _in_order(results):
+            yield pair
+        return
+    for result in results:
+        for _, n, factors in result:
+            yield n, factors
+
+
+def _product(values):
+    """The product of `values`, multiplied pairwise as a balanced binary
+    tree so that both operands of every multiplication have similar sizes
+    """
+    values = list(values)
+    while len(values) > 1:
+        paired = [values[i] * values[i + 1]
+                  for i in range(0, len(values) - 1, 2)]
+        if len(values) & 1:
+            paired.append(values[-1])
+        values = paired
+    return values[0] if values else 1
+
+
+def _from_decomposition(factors):
+    """The integer with prime decomposition `factors`, {prime: exponent}.
+    Running from the top exponent bit down, the partial result is squared
+    and multiplied by the product of the primes having that bit set, so n!
+    costs about log2(n) squarings plus balanced products of primes.
+    """
+    result = 1
+    top = max(factors.values(), default=0).bit_length()
+    for bit in range(top - 1, -1, -1):
+        result *= result
+        result *= _product(p for p, e in factors.items() if e >> bit & 1)
+    return result
+
+
+def _legendre(n, p):
+    """The exponent of the prime `p` in n!, by Legendre's formula
+    """
+    e = 0
+    while n:
+        n //= p
+        e += n
+    return e
+
+
+def _multinomial_decomposition(counts):
+    """The prime decomposition of (sum of counts)! / prod(count!)
+    """
+    if any(k < 0 for k in counts):
+        raise ValueError("Multinomial coefficients need non-negative counts")
+    n = sum(counts)
+    factors = {}
+    for p in _primes_up_to(n):
+        e = _legendre(n, p) - sum(_legendre(k, p) for k in counts)
+        if e:
+            factors[p] = e
+    return factors
+
+
+def _multinomial(counts):
+    """(sum of counts)! / prod(count!). With the largest count K set
+    aside, the rest sum to m = n - K; while m^2 <= 16 n the balanced
+    product of K + 1, ..., n divided by the factorials of the rest beats
+    sieving every prime up to n, so only then is the decomposition built
+    """
+    counts = sorted(counts)
+    if counts and counts[0] < 0:
+        raise ValueError("Multinomial coefficients need non-negative counts")
+    n = sum(counts)
+    rest = n - counts[-1] if counts else 0
+    if rest * rest <= 16 * n:
+        return _product(range(n - rest + 1, n + 1)) // \
+            _product(factorial(k) for k in counts[:-1])
+    return _from_decomposition(_multinomial_decomposition(counts))
+
+
+def factorial_decomposition(n):
+    """The prime decomposition of n! by Legendre's formula, without
+    computing n!
+    Args:
+        n (int): non-negative integer
+    Returns:
+        (dict): {prime: exponent}, in ascending order of primes
+    """
+    if n < 0:
+        raise ValueError("Factorial is not defined for negative integers")
+    return {p: _legendre(n, p) for p in _primes_up_to(n)}
+
+
+def factorial(n):
+    """n!, built from `factorial_decomposition` with balanced
+    multiplications
+    Args:
+        n (int): non-negative integer
+    Returns:
+        (int): n!
+    """
+    return _from_decomposition(factorial_decomposition(n))
+
+
+def binomial(n, k):
+    """The binomial coefficient n choose k, as n (n - 1) ... (n - k + 1) / k!
+    for small min(k, n - k), else from its prime decomposition
+    Args:
+        n (int): non-negative integer
+        k (int): integer; outside 0 <= k <= n the coefficient is 0
+    Returns:
+        (int): n! / (k! (n - k)!)
+    """
+    if n < 0:
+        raise ValueError("Binomial coefficients need non-negative n")
+    if not 0 <= k <= n:
+        return 0
+    return _multinomial((k, n - k))
+
+
+def multinomial(*counts):
+    """The multinomial coefficient (k1 + k2 + ...)! / (k1! k2! ...), by
+    `binomial`'s rule with the largest count in place of max(k, n - k)
+    Args:
+        *counts (int): non-negative integers k1, k2, ...
+    Returns:
+        (int): the number of arrangements of k1 + k2 + ... objects with
+            k1, k2, ... of each kind
+    """
+    return _multinomial(counts)
+
+
+def _heappush(heap, item):
+    """Push `item` onto the binary min-heap `heap` (a list)
+    """
+    heap.append(item)
+    i = len(heap) - 1
+    while i:
+        parent = (i - 1) >> 1
+        if heap[parent] <= item:
+            break
+        heap[i] = heap[parent]
+        i = parent
+    heap[i] = item
+
+
+def _heappop(heap):
+    """Pop the smallest item off the binary min-heap `heap`
     """
-    found = list()
-    candidate = 2
+    last = heap.pop()
+    if not heap:
+        return last
+    smallest, heap[0] = heap[0], last
+    i, size = 0, len(heap)
     while True:
-        if all(candidate % prime for prime in found):
-            yield candidate
-            found.append(candidate)
-        candidate += 1
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and heap[child + 1] < heap[child]:
+            child += 1
+        if last <= heap[child]:
+            break
+        heap[i] = heap[child]
+        i = child
+    heap[i] = last
+    return smallest
+
+
+def _ordered_divisors(factors, bound=None):
+    """Generate the divisors of the number with prime decomposition
+    `factors` in increasing order, optionally only those <= `bound`.
+    A divisor is reached only by raising its primes in increasing order, so
+    a heap of (divisor, index of its largest prime, that prime's exponent)
+    holds just the frontier of the divisor lattice, never the whole set.
+    """
+    primes = list(factors)
+    exponents = [factors[p] for p in primes]
+    if bound is not None and bound < 1:
+        return
+    heap = [(1, 0, 0)]
+    while heap:
+        d, i, e = _heappop(heap)
+        yield d
+        for j in range(i, len(primes)):
+            exponent = e + 1 if j == i else 1
+            if exponent > exponents[j]:
+                continue
+            child = d * primes[j]
+            if bound is None or child <= bound:
+                _heappush(heap, (child, j, exponent))
+
+
+def _all_divisors(factors):
+    """Every divisor of the number with prime decomposition `factors`,
+    unordered
+    """
+    divisors = [1]
+    for p, e in factors.items():
+        divisors = [d * p ** k for d in divisors for k in range(e + 1)]
+    return divisors
+
+
+def _count_divisors(factors, bound):
+    """How many divisors of the number with prime decomposition `factors`
+    are <= `bound`, without listing them
+    """
+    if bound < 1:
+        return 0
+    items = list(factors.items())
+    count, stack = 0, [(1, 0)]
+    while stack:
+        d, i = stack.pop()
+        count += 1
+        for j in range(i, len(items)):
+            p, e = items[j]
+            m = d
+            for _ in range(e):
+                m *= p
+                if m > bound:
+                    break
+                stack.append((m, j + 1))
+    return count
+
+
+def _multiples_mask(p, n):
+    """Int with bit k set for every multiple k of `p` in [1, `n`], built in
+    O(log n) big-int operations by doubling the pattern
+    """
+    mask, span = 1 << p, p
+    while span < n:
+        mask |= mask << span
+        span <<= 1
+    return mask & ((2 << n) - 1)
+
+
+def _coprime_block(lo, hi, primes):
+    """Bytearray whose i-th byte is 1 if and only if lo + i is divisible
+    by none of `primes`, for lo + i in [`lo`, `hi`)
+    """
+    block = bytearray([1]) * (hi - lo)
+    for p in primes:
+        start = -lo % p
+        block[start::p] = bytes(len(range(start, hi - lo, p)))
+    return block
+
+
+def _goldbach_flags(n):
+    """For even `n` >= 6, a bytes object whose byte i is 1 if and only if
+    both 2i + 1 and `n` - (2i + 1) are prime, for 1 <= i <= (n/2 - 1) / 2
+    (byte 0 is unused). One odd-only sieve up to `n` covers both primes;
+    the flags of the n - p side are reversed and the two sides ANDed as
+    ints, so no Python loop runs per candidate.
+    """
+    half = n >> 1
+    _, flags = _sieve_segment(0, n + 1, _primes_up_to(_isqrt(n))[1:])
+    last = (half - 1) >> 1
+    low = flags[:last + 1]
+    high = flags[half - 1 - last:half]
+    high.reverse()
+    both = int.from_bytes(low, "little") & int.from_bytes(high, "little")
+    return both.to_bytes(last + 1, "little")
+
+
+# Invariants computed for each value, shared by every Integer equal to it,
+# as a {name: value} dict per value
+invariant_cache = LRUCache()
+
+
+def _invariants_of(n):
+    """The dict of invariants cached for the value of `n`, created empty and
+    marked most recently used
+    """
+    key = int(n)
+    invariants = invariant_cache.get(key)
+    if invariants is None:
+        invariants = {}
+        invariant_cache.put(key, invariants)
+    return invariants
+
+
+class _invariant(object):
+    """Decorator for the arithmetic invariants of `Integer`: a read-only
+    property evaluated at most once per value while that value stays in
+    `invariant_cache`. Integer instances carry no __dict__, so the cache
+    stands in for one, and equal Integers share its entry.
+    """
+
+    def __init__(self, function):
+        self.function = function
+        self.name = function.__name__
+        self.__doc__ = function.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        invariants = _invariants_of(instance)
+        try:
+            value = invariants[self.name]
+        except KeyError:
+            if _counts is None:
+                value = invariants[self.name] = self.function(instance)
+                return value
+            _tally("computed." + self.name)
+            if _clock is None:
+                value = invariants[self.name] = self.function(instance)
+                return value
+            start = _clock()
+            try:
+                value = invariants[self.name] = self.function(instance)
+            finally:
+                elapsed = _clock() - start
+                _seconds[self.name] = _seconds.get(self.name, 0) + elapsed
+            return value
+        if _counts is not None:
+            _tally("cached." + self.name)
+        return value
+
+
+def _timed(function):
+    """Decorator for the uncached, costly properties of `Integer`: a
+    read-only property whose evaluation is timed under its name while
+    `Instrumentation` collects with a clock
+    """
+    name = function.__name__
+
+    def timed(instance):
+        if _clock is None:
+            return function(instance)
+        start = _clock()
+        try:
+            return function(instance)
+        finally:
+            elapsed = _clock() - start
+            _seconds[name] = _seconds.get(name, 0) + elapsed
+
+    timed.__name__, timed.__doc__ = name, function.__doc__
+    return property(timed)
+
+
+class Instrumentation(object):
+    """Opt-in counters for the work behind every answer: primality tests,
+    trial divisions, gcds, the method each factorization step dispatched
+    to ("factorize.spf_table", ".cached", ".known_divisor",
+    ".perfect_power", ".rho", ".ecm", ".siqs"), the invariants computed
+    and read back ("computed.<name>", "cached.<name>") and the hits and
+    misses of both caches since collection started. While it is off each
+    instrumented spot costs one comparison with None. The module imports
+    nothing, so wall time needs a clock, e.g. `time.perf_counter`: given
+    one, each invariant's computation and each read of the costly plain
+    properties (decomposition, divisors, totatives, factorial, ...) is
+    timed, including the invariants it reads in turn. Use the
+    `instrumentation` instance:
+
+        with instrumentation.collect(time.perf_counter) as scope:
+            Integer(n).sigma
+        scope.stats["counts"]["factorize"]
+
+    `profile_hook` also counts and times the calls to this module's
+    functions when passed to `sys.setprofile`.
+    """
+
+    _COUNTERS = ("hits", "misses", "evictions", "partial_hits")
+
+    def __init__(self):
+        self._baseline = {}
+        self._calls = []
+
+    @property
+    def enabled(self):
+        return _counts is not None
+
+    @staticmethod
+    def _caches():
+        return {"factorization": factorization_cache.stats(),
+                "invariant": invariant_cache.stats()}
+
+    def enable(self, clock=None):
+        """Start collecting from zero
+        Args:
+            clock (callable): returns seconds; None counts without timing
+        """
+        global _counts, _seconds, _clock
+        _counts, _seconds, _clock = {}, {}, clock
+        self._baseline = self._caches()
+
+    def disable(self):
+        """Stop collecting
+        Returns:
+            (dict): the final `stats`
+        """
+        global _counts, _seconds, _clock
+        stats = self.stats()
+        _counts = _seconds = _clock = None
+        del self._calls[:]
+        return stats
+
+    def reset(self):
+        """Zero the counts, seconds and cache figures, collecting on
+        """
+        if _counts is not None:
+            _counts.clear()
+            _seconds.clear()
+            self._baseline = self._caches()
+
+    def stats(self):
+        """Snapshot of what was collected since `enable` or `reset`
+        Returns:
+            (dict): "enabled"; "counts", {event: count}; "seconds",
+                {property or function: seconds}; "caches", the `stats` of
+                `factorization_cache` and `invariant_cache` with their
+                counters relative to the start
+        """
+        caches = {}
+        for name, stats in self._caches().items():
+            baseline = self._baseline.get(name, {})
+            caches[name] = {key: value - baseline.get(key, 0)
+                            if key in self._COUNTERS else value
+                            for key, value in stats.items()}
+        return {"enabled": self.enabled,
+                "counts": dict(sorted((_counts or {}).items())),
+                "seconds": dict(sorted((_seconds or {}).items())),
+                "caches": caches}
+
+    def collect(self, clock=None):
+        """Context manager collecting afresh within its block, into its
+        `stats` attribute at exit; whatever an enclosing collection was
+        doing resumes afterwards, with the block's counts added to it
+        """
+        return _InstrumentationScope(self, clock)
+
+    def profile_hook(self, frame, event, arg):
+        """`sys.setprofile` callback counting, while collecting, the calls
+        to this module's functions as "calls.<name>" and, with a clock,
+        timing them inclusively under the same name
+        """
+        if _counts is None or frame.f_globals is not _MODULE_GLOBALS or \
+                frame.f_code is _tally.__code__:
+            return
+        name = "calls." + frame.f_code.co_name
+        if event == "call":
+            _tally(name)
+            if _clock is not None:
+                self._calls.append((frame, _clock, _clock()))
+        elif event == "return" and self._calls and \
+                self._calls[-1][0] is frame:
+            # Timed by the clock it started on, which a nested collection
+            # may have swapped out; one without a clock times nothing
+            _, clock, start = self._calls.pop()
+            if _clock is not None:
+                elapsed = clock() - start
+                _seconds[name] = _seconds.get(name, 0) + elapsed
+
+
+class _InstrumentationScope(object):
+    """The context manager of `Instrumentation.collect`
+    """
+
+    def __init__(self, instrumentation, clock):
+        self.instrumentation = instrumentation
+        self.clock = clock
+        self.stats = None
+
+    def __enter__(self):
+        self._outer = (_counts, _seconds, _clock,
+                       self.instrumentation._baseline)
+        self.instrumentation.enable(self.clock)
+        return self
+
+    def __exit__(self, *exc_info):
+        global _counts, _seconds, _clock
+        self.stats = self.instrumentation.stats()
+        counts, seconds = _counts, _seconds
+        _counts, _seconds, _clock, self.instrumentation._baseline = \
+            self._outer
+        if _counts is not None:
+            for name, count in counts.items():
+                _counts[name] = _counts.get(name, 0) + count
+            for name, elapsed in seconds.items():
+                _seconds[name] = _seconds.get(name, 0) + elapsed
+        return False
+
+
+instrumentation = Instrumentation()
+_MODULE_GLOBALS = globals()
 
 
 class Integer(int):
@@ -74,65 +2353,92 @@ class Integer(int):
     property `primality`.
     """
 
-    def __init__(self, num):
+    # The invariants reported by `profile`
+    _PROFILE = ("decomposition", "factorization", "primality", "parity",
+                "tau", "sigma", "euler_totient", "carmichael", "Omega",
+                "omega", "radical", "is_squarefree", "is_perfect")
+
+    # No __dict__: an Integer is exactly as large as the int it wraps, and
+    # its invariants live in `invariant_cache`
+    __slots__ = ()
+
+    def __new__(cls, num):
         try:
-            self.num = int(num)
+            return int.__new__(cls, num)
         except (OverflowError, TypeError, ValueError):
             raise ValueError("Integer must be finite and numeric")
 
+    @property
+    def num(self):
+        """The value as a plain int, kept for compatibility
+        """
+        return int(self)
+
     def __repr__(self):
-        return "Integer({!r})".format(self.num)
+        return "Integer({!r})".format(int(self))
 
-    def __bool__(self):
-        return self.num.__bool__()
+    # The results of int arithmetic are wrapped with int.__new__ directly,
+    # skipping the conversion checks of Integer(); anything int itself does
+    # not handle falls back to the plain value, as the other operand sees it
 
     def __add__(self, other):
-        num = self.num + other
-        return Integer(num) if isinstance(num, int) else num
+        num = int.__add__(self, other)
+        if num is NotImplemented:
+            return int(self) + other
+        return int.__new__(Integer, num)
 
     def __sub__(self, other):
-        num = self.num - other
-        return Integer(num) if isinstance(num, int) else num
+        num = int.__sub__(self, other)
+        if num is NotImplemented:
+            return int(self) - other
+        return int.__new__(Integer, num)
 
     def __mod__(self, other):
-        num = self.num % other
-        return Integer(num) if isinstance(num, int) else num
+        num = int.__mod__(self, other)
+        if num is NotImplemented:
+            return int(self) % other
+        return int.__new__(Integer, num)
 
     def __rmod__(self, other):
-        num = other % self.num
-        return Integer(num) if isinstance(num, int) else num
+        num = int.__rmod__(self, other)
+        if num is NotImplemented:
+            return other % int(self)
+        return int.__new__(Integer, num)
 
     def __neg__(self):
-        num = -self.num
-        return Integer(num)
+        return int.__new__(Integer, int.__neg__(self))
 
     def __mul__(self, other):
-        num = self.num * other
-        return Integer(num) if isinstance(num, int) else num
+        num = int.__mul__(self, other)
+        if num is NotImplemented:
+            return int(self) * other
+        return int.__new__(Integer, num)
 
     def __rmul__(self, other):
-        num = other * self.num
-        return Integer(num) if isinstance(num, int) else num
+        num = int.__rmul__(self, other)
+        if num is NotImplemented:
+            return other * int(self)
+        return int.__new__(Integer, num)
 
     def __truediv__(self, other):
-        num = self.num / other
+        num = int(self) / other
         return num
 
     def __rtruediv__(self, other):
-        num = other / self.num
+        num = other / int(self)
         return num
 
     def __floordiv__(self, other):
-        num = self.num / other
+        num = int(self) / other
         return num
 
     def __rfloordiv__(self, other):
-        num = other / self.num
+        num = other / int(self)
         return num
 
     def __pow__(self, p):
-        num = self.num ** p
-        return Integer(num) if isinstance(num, int) else num
+        num = int(self) ** p
+        return int.__new__(Integer, num) if isinstance(num, int) else num
 
     @staticmethod
     def gcd(a, b):
@@ -166,7 +2472,7 @@ class Integer(int):
         if self.num == 0:
             return True  # zero to any k is zero
 
-        return all(x % k == 0 for x in self.decomposition.values())
+        return all(x % k == 0 for x in self._factors.values())
 
     def is_power_of(self, n):
         """Is the integer, z, a power of n? I.e. z is a power of n if and
@@ -203,7 +2509,13 @@ class Integer(int):
             # There is no other integer such that is a power of 1
             return False
 
-        return list(self.decomposition.keys()) == [n]
+        return list(self._factors) == [n]
+
+    def profile(self):
+        """Every arithmetic invariant of Integer() at once, all derived from
+        a single factorization, as a dictionary keyed by property name
+        """
+        return {name: getattr(self, name) for name in self._PROFILE}
 
     @property
     def binary(self):
@@ -211,113 +2523,197 @@ class Integer(int):
         """
         return bin(self.num)
 
-    @property
-    def decomposition(self):
-        """Returns the dictionary of prime factors of the given integer, in the
-        form of "prime: power". Credit for the implementation must go to the
-        author: http://stackoverflow.com/a/412942/4747798
+    @_invariant
+    def _factors(self):
+        """The one factorization every other invariant is derived from
         """
-
-        z = self.num
-        if z in (0, 1):
+        if self.num < 2:
             return {}
+        return factorize(self.num)
 
-        factors = []
-        d = 2
-        while z > 1:
-            while z % d == 0:
-                factors.append(d)
-                z /= d
-            d = d + 1
-            if d * d > z:
-                if z > 1:
-                    factors.append(z)
-                break
-
-        return {int(f): int(factors.count(f)) for f in set(factors)}
+    @_timed
+    def decomposition(self):
+        """Returns the dictionary of prime factors of the given integer, in the
+        form of "prime: power". See `factorize` for the algorithms used
+        """
+        return dict(self._factors)
 
-    @property
+    @_timed
     def divisors(self):
         """Returns the set of proper divisors of Integer()
         """
-        return {x for x in range(1, self.num // 2 + 1) if not self.num % x}
+        if self.num < 2:
+            return set()
+        return set(_all_divisors(self._factors)) - {self.num}
 
-    @property
+    def iter_divisors(self, bound=None):
+        """Generate the positive divisors of Integer() (itself included) in
+        increasing order, lazily, from its prime decomposition
+        Args:
+            bound (int): if given, stop at the divisors <= `bound`
+        Yields:
+            (int): the next divisor
+        """
+        if self.num < 1:
+            return iter(())
+        return _ordered_divisors(self._factors, bound)
+
+    def count_divisors(self, bound=None):
+        """The number of positive divisors of Integer() that are <= `bound`
+        (all of them if `bound` is None), counted without listing them
+        """
+        if bound is None:
+            return self.tau
+        if self.num < 1:
+            return Integer(0)
+        return Integer(_count_divisors(self._factors, bound))
+
+    @_invariant
     def euler_totient(self):
         """Returns phi(z) = count of positive integers less than or equal to
-        z that are coprime to z
+        z that are coprime to z, by Euler's product formula
+        phi(p_1^a_1 * ... * p_n^a_n) = prod p_i^(a_i - 1) * (p_i - 1)
         """
-        return Integer(len(self.totatives))
+        return self.jordan_totient(1)
 
-    @property
+    def jordan_totient(self, k):
+        """Jordan's totient J_k(z), the number of k-tuples of integers in
+        [1, z] whose gcd with z is 1; J_1 is Euler's totient. Computed as
+        prod p_i^(k(a_i - 1)) * (p_i^k - 1). More info at
+        https://oeis.org/A007434
+        Args:
+            k (int): positive tuple length
+        Returns:
+            (Integer): 0 if Integer() is not positive
+        """
+        if k < 1:
+            raise ValueError("Jordan's totient is defined for k >= 1")
+        if self.num < 1:
+            return Integer(0)
+        product = 1
+        for p, e in self._factors.items():
+            q = p ** k
+            product *= q ** (e - 1) * (q - 1)
+        return Integer(product)
+
+    @_invariant
+    def carmichael(self):
+        """The Carmichael function lambda(z): the exponent of the
+        multiplicative group modulo z, i.e. the least m > 0 such that
+        a^m = 1 (mod z) for every a coprime to z. More info at
+        https://oeis.org/A002322
+        """
+        if self.num < 1:
+            return Integer(0)
+        result = 1
+        for p, e in self._factors.items():
+            if p == 2 and e >= 3:
+                order = 1 << (e - 2)
+            else:
+                order = p ** (e - 1) * (p - 1)
+            result = result // _gcd(result, order) * order
+        return Integer(result)
+
+    @_timed
     def factorial(self):
-        if self.num < 0:
-            raise ValueError("Factorial is not defined for negative integers")
-        elif self.num == 0:
-            return Integer(1)
-        else:
-            def factorial_(n):
-                return 1 if n < 1 else n * factorial_(n-1)
-            return Integer(factorial_(self.num))
+        """Integer()!, built from its prime decomposition by Legendre's
+        formula; the result already knows that decomposition
+        """
+        factors = factorial_decomposition(self.num)
+        result = Integer(_from_decomposition(factors))
+        _invariants_of(result)["_factors"] = factors
+        return result
 
-    @property
+    @_invariant
     def factorization(self):
         """Quasi human-readable rendering of prime decomposition
         """
         return " * ".join((str(k) + "^" + str(v) for k, v in
-                           self.decomposition.items()))
+                           self._factors.items()))
 
-    @property
+    @_timed
     def goldbach_partitions(self):
         """Returns the Goldbach partitions of Integer(); i.e. the
         expression of an even number as a sum of two primes
         """
+        return set(self.iter_goldbach_partitions())
 
-        if self.parity == "Odd":
-            return set()
-        return set((p, self.num-p)
-                   for p in range(2, self.num // 2 + 1)
-                   if is_prime(p) and is_prime(self.num - p))
+    def iter_goldbach_partitions(self):
+        """Generate the Goldbach partitions (p, z - p), p <= z - p, of
+        Integer() in increasing order of p, from one sieve up to z
+        """
+        z = self.num
+        if z % 2 or z < 4:
+            return
+        if z == 4:
+            yield (2, 2)
+            return
+        flags = _goldbach_flags(z)
+        i = flags.find(1)
+        while i != -1:
+            yield (2 * i + 1, z - 2 * i - 1)
+            i = flags.find(1, i + 1)
+
+    def count_goldbach_partitions(self):
+        """The number of Goldbach partitions of Integer(), counted on the
+        sieve without building them. More info at https://oeis.org/A045917
+        """
+        z = self.num
+        if z % 2 or z < 4:
+            return Integer(0)
+        if z == 4:
+            return Integer(1)
+        return Integer(_goldbach_flags(z).count(1))
+
+    def minimal_goldbach_partition(self):
+        """The Goldbach partition (p, z - p) of Integer() with the smallest
+        prime p, found by testing z - p for the successive primes p with
+        `is_prime`, which needs no sieve however large z is: the primes
+        below 1000 come from a table, and `generate_primes` only continues
+        past them
+        Returns:
+            (tuple): None if Integer() has no Goldbach partition
+        """
+        z = self.num
+        if z % 2 or z < 4:
+            return None
+        for primes in (_SMALL_PRIMES, generate_primes(_SMALL_PRIMES[-1] + 1)):
+            for p in primes:
+                if 2 * p > z:
+                    return None
+                if is_prime(z - p):
+                    return (p, z - p)
 
     @property
     def is_cullen(self):
         """A Cullen number is a natural number, C, of the form C = k*2**k  + 1,
-        where k is an integer
-        """
-        k = 1
-        w = self.num - 1
-        candidate = k*2**k
-        while candidate <= w:
-            if w == candidate:
-                return True
-            k += 1
-            candidate = k*2**k
-            continue
-        else:
-            return False
+        where k is an integer; k is read off the bit length of C - 1
+        """
+        return self.num == 1 or _cullen_woodall_index(self.num - 1) is not None
 
-    @property
+    @_timed
     def is_cullen_prime(self):
         """A Cullen prime is a prime, p of the form p = k*2**k + 1, where k is
-        an integer
+        an integer; decided by Proth's theorem
         """
-        return is_prime(self.num) and self.is_cullen
+        k = _cullen_woodall_index(self.num - 1)
+        return k is not None and _is_proth_prime(*_split_power_of_two(k, k))
 
     @property
     def is_mersenne(self):
         """A Mersenne number is an integer, M, such that M = 2^k - 1, for some
         integer k
         """
-        return self.num > 0 and Integer(self.num + 1).is_power_of(2)
+        return self.num > 0 and not self.num & (self.num + 1)
 
-    @property
+    @_timed
     def is_mersenne_prime(self):
         """A Mersenne prime is a prime, p, of the form p = 2^k - 1, where
-        k is an integer
+        k is an integer; decided by the Lucas-Lehmer test on k
         """
-        return self.num > 0 and is_prime(self.num) and self.is_mersenne
+        return self.is_mersenne and lucas_lehmer(self.num.bit_length())
 
-    @property
+    @_invariant
     def is_perfect(self):
         """A positive integer is perfect if it is equal to the sum of its
         proper divisors; for instance, 6 has divisors {1, 2, 3, 6} (of which
@@ -325,7 +2721,7 @@ class Integer(int):
         """
         return self.sigma == 2 * self.num
 
-    @property
+    @_invariant
     def is_squarefree(self):
         """A positive integer is squarefree if it is not divisible by
         a square greater than 1.
@@ -334,65 +2730,74 @@ class Integer(int):
             return False
         elif self.num == 1:
             return True
-        return all(exponent < 2 for exponent in self.decomposition.values())
+        return all(exponent < 2 for exponent in self._factors.values())
 
     @property
     def is_woodall(self):
         """A Woodall number is an integer, W, of the form W = k*2**k - 1, where
-        k is an integer
+        k is an integer; k is read off the bit length of W + 1
         """
-        if self.num < 1:
-            return False
-        w = self.num + 1
-
-        def woodall(k, w=w):
-            return k * 2 ** k == w
-        range_of_k_to_check = range(1, 4) if self.num < 64 else \
-            range(1, int(pow(w, 1/3)) + 1)
-        return any(map(woodall, range_of_k_to_check))
+        return _cullen_woodall_index(self.num + 1) is not None
 
-    @property
+    @_timed
     def is_woodall_prime(self):
         """A Woodall prime is a prime, p, of the form p = k*2**k - 1, where
-        k is an integer
+        k is an integer; decided by the Lucas-Lehmer-Riesel test
         """
-        return is_prime(self.num) and self.is_woodall
+        k = _cullen_woodall_index(self.num + 1)
+        return k is not None and _is_riesel_prime(*_split_power_of_two(k, k))
 
-    @property
+    @_timed
     def nearest_prime(self):
         """If Integer() is prime, returns Integer().num. Otherwise, returns
         either the nearest prime, or the two nearest primes, if equidistant
         Returns:
             (tuple)
         """
-
-        if self.num <= 1:
+        z = self.num
+        if z <= 2:
             return (2,)
-        elif is_prime(self.num):
-            return (self.num,)
-        else:
-            z, s = self.num, sequence()
-
-        while not is_prime(z):
-            z += next(s)
-        else:
-            nearest = z - self.num
+        elif is_prime(z):
+            return (z,)
+        before, after = prev_prime(z), next_prime(z)
+        if z - before == after - z:
+            return (before, after)
+        return (before,) if z - before < after - z else (after,)
+
+    @_timed
+    def next_prime(self):
+        """The smallest prime greater than Integer()
+        """
+        return Integer(next_prime(self.num))
 
-        # Is there another prime equidistant?
-        return (z,) if not is_prime(self.num - nearest) else \
-            tuple(sorted(z, self.num - nearest))
+    @_timed
+    def prev_prime(self):
+        """The largest prime less than Integer(), or None below 3
+        """
+        p = prev_prime(self.num)
+        return None if p is None else Integer(p)
 
-    @property
+    @_invariant
     def Omega(self):
         """The total number of prime factors of Integer()
         """
-        return sum(self.decomposition.values())
+        return sum(self._factors.values())
 
-    @property
+    @_invariant
     def omega(self):
         """The number of distinct prime factors of Integer()
         """
-        return len(self.decomposition)
+        return len(self._factors)
+
+    @_invariant
+    def mobius(self):
+        """The Moebius function mu(z): 0 unless z is squarefree, else -1 to
+        the number of its prime factors. More info at
+        https://oeis.org/A008683
+        """
+        if not self.is_squarefree:
+            return 0
+        return -1 if len(self._factors) & 1 else 1
 
     @property
     def parity(self):
@@ -400,41 +2805,60 @@ class Integer(int):
         """
         return "Odd" if self.num % 2 else "Even"
 
-    @property
+    @_invariant
     def pi(self):
         """Prime Counting Function, i.e. the amount of primes not exceeding
-        Integer
+        Integer. See `prime_count`
         """
-        z = self.num
-        return Integer(sum(1 for x in range(2, z + 1) if is_prime(x)))
+        return Integer(prime_count(self.num))
 
-    @property
+    @_invariant
     def primality(self):
         """Returns "Prime" if prime, "Composite" if not
         """
         return "Prime" if is_prime(self.num) else "Composite"
 
-    @property
+    @_invariant
     def radical(self):
         """Returns the product of the distinct primes dividing n
         """
-        z = self.num
-        if self.is_squarefree:
-            return Integer(z)
-        else:
-            product = 1
-            for prime_factor in self.decomposition.keys():
-                product *= prime_factor
-            return Integer(product)
+        product = 1
+        for prime_factor in self._factors:
+            product *= prime_factor
+        return Integer(product)
 
-    @property
+    @_invariant
     def sigma(self):
         """Returns the aliquot sum of Integer plus the Integer itself;
         i.e. the sum of the divisors of the integer
         """
-        return Integer(sum(self.divisors))
+        return self.sigma_k(1)
+
+    def sigma_k(self, k):
+        """The divisor function: the sum of the `k`-th powers of the
+        divisors of Integer(), by the closed form over its prime powers,
+        sigma_k(p_1^a_1 * ... * p_n^a_n) = prod (p_i^(k(a_i + 1)) - 1) /
+        (p_i^k - 1). sigma_0 is tau and sigma_1 is sigma. More info at
+        https://oeis.org/A000203
+        Args:
+            k (int): non-negative power of the divisors
+        Returns:
+            (Integer): 0 if Integer() is not positive
+        """
+        if k < 0:
+            raise ValueError("sigma_k is only implemented for k >= 0")
+        if self.num < 1:
+            return Integer(0)
+        product = 1
+        for p, e in self._factors.items():
+            if k:
+                q = p ** k
+                product *= (q ** (e + 1) - 1) // (q - 1)
+            else:
+                product *= e + 1
+        return Integer(product)
 
-    @property
+    @_invariant
     def tau(self):
         """Returns the number of divisors of Integer. The Fundamental Theorem of
         Arithmetic guarantees that every given integer is a unique product of
@@ -450,18 +2874,489 @@ class Integer(int):
             return Integer(1)
         else:
             product = 1
-            for z in self.decomposition.values():
+            for z in self._factors.values():
                 product *= (z+1)
             return Integer(product)
 
-    @property
+    @_timed
     def totatives(self):
         """The totatives of z are the k in Z, 1<=k<=z, that are coprime to z
         """
+        return set(self.iter_totatives())
+
+    def iter_totatives(self, block_size=1 << 16):
+        """Generate the totatives of Integer() in increasing order, sieving
+        one block of `block_size` candidates at a time by the prime factors
+        of Integer()
+        """
         z = self.num
-        if z <= 0:
-            return set()
-        return {x for x in range(1, z+1) if self.gcd(z, x) == 1}
+        primes = list(self._factors)
+        for lo in range(1, z + 1, block_size):
+            block = _coprime_block(lo, min(lo + block_size, z + 1), primes)
+            i = block.find(1)
+            while i != -1:
+                yield lo + i
+                i = block.find(1, i + 1)
+
+    def totative_mask(self):
+        """Bitmap of the totatives of Integer(): bit k & 7 of byte k >> 3 is
+        set if and only if 1 <= k <= z and gcd(k, z) == 1. Multiples of each
+        prime factor are struck out of an int of z + 1 bits, so the mask
+        takes (z + 1) / 8 bytes
+        Returns:
+            (bytearray)
+        """
+        z = self.num
+        if z < 1:
+            return bytearray()
+        mask = (2 << z) - 2
+        for p in self._factors:
+            mask &= ~_multiples_mask(p, z)
+        return bytearray(mask.to_bytes((z >> 3) + 1, "little"))
+
+
+# `IntegerRange` sieves by the primes up to this bound at most; whatever
+# cofactor is left above its square and is not prime gets factorized
+_RANGE_SIEVE_LIMIT = 1 << 20
+
+
+def _multiplicative_segment(lo, hi, base_primes):
+    """Sieve the arithmetic functions of every n in [`lo`, `hi`), `lo` >= 1:
+    each multiple of a base prime p has p divided out of what is left of
+    it, and the functions multiplied by their value at the power of p
+    that went, so what is left at the end is 1 or a single prime, unless
+    the base primes stop short of sqrt(hi - 1).
+    Args:
+        lo (int): inclusive lower bound of the segment, at least 1
+        hi (int): exclusive upper bound of the segment
+        base_primes (list): the primes up to at least min(sqrt(hi - 1),
+            `_RANGE_SIEVE_LIMIT`), ascending
+    Returns:
+        (dict): the columns of `IntegerRange.COLUMNS`
+    """
+    size = hi - lo
+    rest = list(range(lo, hi))
+    tau, sigma, phi = [1] * size, [1] * size, [1] * size
+    # Omega(n) <= log2(n), which a byte holds below 2^255
+    omega = bytearray(size)
+    Omega = bytearray(size) if hi.bit_length() < 256 else [0] * size
+    squarefree = bytearray([1]) * size
+    reach = 1
+    for p in base_primes:
+        if p * p >= hi:
+            break
+        reach = p
+        sigmas, phis = [1, p + 1], [1, p - 1]
+        for j in range(-lo % p, size, p):
+            r, a = rest[j] // p, 1
+            while not r % p:
+                r //= p
+                a += 1
+            rest[j] = r
+            if a == 1:
+                tau[j] <<= 1
+                sigma[j] *= p + 1
+                phi[j] *= p - 1
+            else:
+                while len(sigmas) <= a:
+                    sigmas.append(sigmas[-1] * p + 1)
+                    phis.append(phis[-1] * p)
+                tau[j] *= a + 1
+                sigma[j] *= sigmas[a]
+                phi[j] *= phis[a]
+                squarefree[j] = 0
+            omega[j] += 1
+            Omega[j] += a
+    bound = (reach + 1) ** 2
+    for j, r in enumerate(rest):
+        if r == 1:
+            continue
+        if r < bound or is_prime(r):
+            factors = {r: 1}
+        else:
+            factors = factorize(r)
+        for q, a in factors.items():
+            tau[j] *= a + 1
+            sigma[j] *= (q ** (a + 1) - 1) // (q - 1)
+            phi[j] *= q ** (a - 1) * (q - 1)
+            omega[j] += 1
+            Omega[j] += a
+            if a > 1:
+                squarefree[j] = 0
+    mobius = [(-1 if omega[j] & 1 else 1) if squarefree[j] else 0
+              for j in range(size)]
+    return {"tau": tau, "sigma": sigma, "euler_totient": phi,
+            "omega": omega, "Omega": Omega, "is_squarefree": squarefree,
+            "mobius": mobius}
+
+
+class IntegerRange(object):
+    """The arithmetic functions of every integer in range(`start`, `stop`)
+    at once, sieved one segment of `segment_size` integers at a time
+    rather than factoring an Integer per number. Each column lists plain
+    values in range order, equal to the Integer properties of the same
+    name: tau, sigma, euler_totient and mobius as lists, omega, Omega and
+    is_squarefree (0 or 1) as bytearrays.
+
+    >>> IntegerRange(1, 7).column("tau")
+    [1, 2, 2, 3, 2, 4]
+    """
+
+    COLUMNS = ("tau", "sigma", "euler_totient", "omega", "Omega",
+               "is_squarefree", "mobius")
+
+    # Columns whose values do not fit a byte
+    _WIDE = ("tau", "sigma", "euler_totient", "mobius")
+
+    def __init__(self, start, stop, segment_size=1 << 16):
+        if segment_size < 1:
+            raise ValueError("Segment size must be positive")
+        self.start, self.stop = start, stop
+        self.segment_size = segment_size
+
+    def __len__(self):
+        return max(self.stop - self.start, 0)
+
+    def __repr__(self):
+        return "IntegerRange({!r}, {!r})".format(self.start, self.stop)
+
+    @classmethod
+    def _zeros(cls, size, names):
+        return {name: [0] * size if name in cls._WIDE else bytearray(size)
+                for name in names}
+
+    def segments(self, names=COLUMNS):
+        """Generate the range segment by segment, so memory stays bounded
+        by the segment size whatever the length of the range
+        Args:
+            names (tuple): the columns wanted, from `COLUMNS`
+        Yields:
+            (tuple): (lo, hi, {name: column}) for consecutive [lo, hi)
+        """
+        for name in names:
+            if name not in self.COLUMNS:
+                raise ValueError("Unknown column {!r}".format(name))
+        lo = self.start
+        while lo < min(self.stop, 1):
+            # Every column is 0 for n < 1, as in Integer
+            hi = min(lo + self.segment_size, self.stop, 1)
+            yield lo, hi, self._zeros(hi - lo, names)
+            lo = hi
+        if lo >= self.stop:
+            return
+        base_primes = _primes_up_to(
+            min(_isqrt(self.stop - 1), _RANGE_SIEVE_LIMIT))
+        while lo < self.stop:
+            hi = min(lo + self.segment_size, self.stop)
+            columns = _multiplicative_segment(lo, hi, base_primes)
+            yield lo, hi, {name: columns[name] for name in names}
+            lo = hi
+
+    def columns(self, *names):
+        """The columns `names` (default: all) over the whole range, built in
+        one pass
+        Returns:
+            (dict): {name: column}
+        """
+        names = names or self.COLUMNS
+        result = {}
+        for _, _, columns in self.segments(names):
+            for name, column in columns.items():
+                result.setdefault(name, column[:0]).extend(column)
+        return result or self._zeros(0, names)
+
+    def column(self, name):
+        """The column `name` over the whole range
+        """
+        return self.columns(name)[name]
+
+
+def _superior_highly_composite_steps():
+    """Generate the superior highly composite numbers as steps (S, b, p, e):
+    S is the current number with prime decomposition b, p the prime the
+    next one multiplies it by and e the critical exponent at which both
+    maximise d(n) / n^e. Raising p from exponent a to a + 1 pays off once e
+    falls below log((a + 2) / (a + 1)) / log p, so the steps are those
+    thresholds in decreasing order.
+    """
+    heap = [(-1.0, 2, 0)]
+    S, exponents = 1, {}
+    while True:
+        negative, p, a = _heappop(heap)
+        yield S, dict(exponents), p, -negative
+        S *= p
+        exponents[p] = a + 1
+        _heappush(heap, (-_log((a + 3) / (a + 2)) / _log(p), p, a + 1))
+        if a == 0:
+            q = next_prime(p)
+            _heappush(heap, (-_LN2 / _log(q), q, 0))
+
+
+def superior_highly_composite_numbers():
+    """Generate the superior highly composite numbers, the n maximising
+    d(n) / n^e for some e > 0: 2, 6, 12, 60, 120, 360, ... More info at
+    https://oeis.org/A002201
+    """
+    steps = _superior_highly_composite_steps()
+    next(steps)
+    for S, _, _, _ in steps:
+        yield S
+
+
+def _composite_options(best, p, epsilon, monotone):
+    """The primes and exponents that can occur in [S, S*p), where S, with
+    prime decomposition `best`, and S*p are consecutive superior highly
+    composite numbers maximising g(n) = log d(n) - `epsilon` log n. A
+    number n falls short of g(S) by a sum of non-negative terms, one per
+    prime, and any n in that range with d(n) >= d(S) falls short by at
+    most epsilon log p, which bounds every term and, when the primes of n
+    are consecutive (`monotone`), the sum of those of the primes new to S.
+    Returns:
+        (tuple): the primes q, ascending; per prime the affordable
+            (shortfall, a, q^a) by increasing shortfall; and per prime
+            and cap c the least total shortfall of that and the later
+            primes with no exponent above c
+    """
+    budget = epsilon * _log(p) * (1 + 1e-9) + 1e-9
+    primes = list(best)
+    # Primes absent from S may enter with exponent 1 while it is cheap
+    candidates, total = _primes_up_to(2 * (primes[-1] if primes else 1)), 0.0
+    i = len(primes)
+    while True:
+        if i == len(candidates):
+            candidates = _primes_up_to(2 * candidates[-1])
+        shortfall = epsilon * _log(candidates[i]) - _LN2
+        total = total + shortfall if monotone else shortfall
+        if total > budget:
+            break
+        primes.append(candidates[i])
+        i += 1
+    choices = []
+    for q in primes:
+        log_q, b = _log(q), best.get(q, 0)
+        peak = _log(b + 1) - epsilon * b * log_q
+        affordable, a = [], 0
+        while True:
+            shortfall = peak - _log(a + 1) + epsilon * a * log_q
+            if shortfall <= budget:
+                affordable.append((shortfall, a, q ** a))
+            elif a > b:
+                break
+            a += 1
+        choices.append(sorted(affordable))
+    cap = max(a for affordable in choices for _, a, _ in affordable)
+    least = [[0.0] * (cap + 1)]
+    for affordable in reversed(choices):
+        by_exponent = {a: shortfall for shortfall, a, _ in affordable}
+        row, low = [], float("inf")
+        for c in range(cap + 1):
+            low = min(low, by_exponent.get(c, low))
+            row.append(low + least[-1][c])
+        least.append(row)
+    return primes, choices, least[::-1]
+
+
+def _composite_frontier(S, tau, epsilon, options, hi, previous, strict,
+                        monotone):
+    """The records in [`S`, `hi`): the n with d(n) above (`strict`) or at
+    least equal to the d(m) of every m < n. A branch and bound over the
+    exponent vectors of `_composite_options` keeps the staircase of the
+    numbers found so far; with g as there, every completion m of a
+    partial vector has log d(m) <= g(S) - shortfall + epsilon log m, so
+    the vector is dropped once that line stays under the staircase to its
+    right, i.e. every completion has a smaller number with as many
+    divisors.
+    Args:
+        S (int): superior highly composite number
+        tau (int): d(S)
+        epsilon (float): its critical exponent
+        options (tuple): from `_composite_options`
+        hi (int): the next superior highly composite number
+        previous (tuple): (n, d(n)) of the last record below `S`
+        strict (bool): records need more divisors, not as many
+        monotone (bool): only non-increasing exponents over consecutive
+            primes, which is all highly composite numbers can have
+    Returns:
+        (list): the records (n, d(n)), ascending
+    """
+    primes, choices, least = options
+    g = _log(tau) - epsilon * _log(S) + 1e-9
+    end = len(primes)
+    support = sum(1 for q in primes if S % q == 0)
+    # Steps (x, y), ascending in both: from x to the next step, numbers
+    # need more than level(y) divisors to be records. ceilings[k] is the
+    # log of that level less epsilon log(next x), lows[k] their least
+    # from step k on.
+    steps, ceilings, lows = [previous], [], []
+    infinite = float("inf")
+
+    def level(y):
+        return y if strict else y - 1
+
+    def ceiling_of(k):
+        y = level(steps[k][1])
+        x = hi if k + 1 == len(steps) else steps[k + 1][0]
+        return _log(y) - epsilon * _log(x) if y > 0 else -infinite
+
+    def survey(k):
+        # Refresh after step k arrived: its ceiling, that of the step
+        # before, whose next x it is, and all lows from it down
+        for j in range(k, max(k - 2, -1), -1):
+            ceilings[j] = ceiling_of(j)
+        low = lows[k + 1] if k + 1 < len(steps) else infinite
+        for j in range(k, -1, -1):
+            low = min(ceilings[j], low)
+            if j < k - 1 and lows[j] == low:
+                # Nothing further down depends on what changed
+                break
+            lows[j] = low
+
+    def step_of(n):
+        # Index of the last step with x < n
+        a, b = 0, len(steps)
+        while b - a > 1:
+            middle = (a + b) >> 1
+            if steps[middle][0] < n:
+                a = middle
+            else:
+                b = middle
+        return a
+
+    def record(n, divisors, k=None):
+        if k is None:
+            k = step_of(n)
+        if n >= S and divisors > level(steps[k][1]):
+            # The following steps with no more divisors stop being
+            # records; the staircase ascends, so they come first
+            j = k + 1
+            while j < len(steps) and steps[j][1] <= level(divisors):
+                j += 1
+            steps[k + 1:j] = [(n, divisors)]
+            ceilings[k + 1:j] = [0.0]
+            lows[k + 1:j] = [0.0]
+            survey(k + 1)
+
+    ceilings.append(0.0)
+    lows.append(0.0)
+    survey(0)
+    # Shortfall of exponent 1 per prime, None where it is not affordable
+    ones = [next((shortfall for shortfall, a, _ in affordable if a == 1),
+                 None) for affordable in choices]
+    stack = [(0, 1, 1, 0.0, len(least[0]) - 1)]
+    while stack:
+        i, n, divisors, spent, ceiling = stack.pop()
+        if n >= hi or g - spent - least[i][ceiling] <= lows[step_of(n)]:
+            continue
+        if i == end or (monotone and ceiling == 0):
+            record(n, divisors)
+            continue
+        if monotone and ceiling == 1:
+            # Only a run of exponents 1 then 0s is left: walk the run
+            # prime by prime instead of a node per prime, trying to stop
+            # after each. Where exponent 1 is unaffordable the run ends.
+            while True:
+                bound = g - spent - least[i][0]
+                if bound > lows[0]:
+                    k = step_of(n)
+                    if bound > lows[k]:
+                        record(n, divisors, k)
+                if i == end or ones[i] is None or \
+                        g - spent - least[i][1] <= lows[0]:
+                    break
+                spent += ones[i]
+                n *= primes[i]
+                divisors <<= 1
+                i += 1
+                if n >= hi:
+                    break
+            continue
+        floor, children = lows[0], []
+        if not monotone and i >= support:
+            # Past the primes of S every exponent may be 0, so jump
+            # straight to the next prime that gets a positive one
+            record(n, divisors)
+            for t in range(i, end):
+                # Both the shortfall and the staircase rise with q
+                shortfall, a, power = choices[t][1]
+                m = n * power
+                if m >= hi or g - spent - shortfall <= lows[step_of(m)]:
+                    break
+                for shortfall, a, power in choices[t][1:]:
+                    m = n * power
+                    if m >= hi or \
+                            g - spent - shortfall <= lows[step_of(m)]:
+                        break
+                    children.append((t + 1, m, divisors * (a + 1),
+                                     spent + shortfall, ceiling))
+        else:
+            after = least[i + 1]
+            for shortfall, a, power in choices[i]:
+                if g - spent - shortfall <= floor:
+                    break
+                if monotone and (a > ceiling or
+                                 g - spent - shortfall - after[a] <= floor):
+                    continue
+                m = n * power
+                if m < hi:
+                    children.append((i + 1, m, divisors * (a + 1),
+                                     spent + shortfall,
+                                     a if monotone else ceiling))
+        stack.extend(reversed(children))
+    return [step for step in steps if step[0] >= S]
+
+
+def _composite_records(monotone, strict):
+    """Generate the n with d(n) above (`strict`) or at least equal to the
+    d(m) of every m < n, one interval between consecutive superior highly
+    composite numbers at a time
+    """
+    previous = (0, 0)
+    for S, best, p, epsilon in _superior_highly_composite_steps():
+        options = _composite_options(best, p, epsilon, monotone)
+        tau = 1
+        for b in best.values():
+            tau *= b + 1
+        for previous in _composite_frontier(S, tau, epsilon, options, S * p,
+                                            previous, strict, monotone):
+            yield previous[0]
+
+
+# The highly composite numbers generated so far, in order, and the search
+# that extends them; shared so that later calls only pay for new terms
+_highly_composite = []
+_highly_composite_search = None
+
+
+def _highly_composite_up_to(count):
+    """Extend `_highly_composite` to at least `count` terms
+    """
+    global _highly_composite_search
+    if _highly_composite_search is None:
+        _highly_composite_search = _composite_records(monotone=True,
+                                                      strict=True)
+    while len(_highly_composite) < count:
+        _highly_composite.append(next(_highly_composite_search))
+
+
+def highly_composite_numbers():
+    """Generate the highly composite numbers, the n with more divisors
+    than any smaller positive integer: 1, 2, 4, 6, 12, 24, ... More info
+    at https://oeis.org/A002182. Terms already found by any caller are
+    replayed from a module-level list; only new ones are searched for.
+    """
+    i = 0
+    while True:
+        _highly_composite_up_to(i + 1)
+        yield _highly_composite[i]
+        i += 1
+
+
+def largely_composite_numbers():
+    """Generate the largely composite numbers, the n with at least as
+    many divisors as any smaller positive integer: 1, 2, 3, 4, 6, 8, ...
+    More info at https://oeis.org/A067128
+    """
+    return _composite_records(monotone=False, strict=False)
 
 
 def nth_most_divisors(n):
@@ -475,28 +3370,315 @@ def nth_most_divisors(n):
     Returns:
         (int): the integer in position `n` in the Highly Composite Numbers seq
     """
+    if n < 1:
+        raise ValueError("Highly composite numbers are indexed from 1")
+    _highly_composite_up_to(n)
+    return _highly_composite[n - 1]
 
-    if n == 1:
-        return 1
-    record = [1]
-    z = 2
-
-    while z >= 1:
-        # Get the number of divisors of the current integer
-        dz = Integer(z).tau
 
-        if dz > max(record):
-            record.append(dz)
-            if len(record) == n:
+def _mersenne_exponents(sieve_limit):
+    """The primes p, ascending, for which 2^p - 1 has no factor q < 2^p - 1
+    up to max(`sieve_limit`, p^2). Every such factor is 2mp + 1 and +-1
+    mod 8, so about one in 4p numbers needs trying, with one `pow` each.
+    """
+    for p in generate_primes():
+        mersenne = (1 << p) - 1
+        bound = min(max(sieve_limit, p * p), mersenne - 1)
+        q = 2 * p + 1
+        while q <= bound:
+            if q & 7 in (1, 7) and pow(2, p, q) == 1:
                 break
-            else:
-                z += 1
-                continue
-        elif dz == max(record):
-            z += 1
-            continue
+            q += 2 * p
         else:
-            z += 1
-            continue
+            yield p
+
 
-    return z
+def _cullen_woodall_candidates(sign, sieve_limit, window=1 << 8):
+    """The k >= 1, ascending, for which k * 2^k + `sign` has no odd prime
+    factor q other than itself up to a depth of 4k, capped at
+    `sieve_limit`; beyond that testing outweighs sieving. The sieve runs
+    over a window of k at a time in parameter space: along the window,
+    k * 2^k and 2^k are stepped modulo each q, so no candidate is built.
+    """
+    primes = _primes_up_to(sieve_limit)[1:]
+    lo = 1
+    while True:
+        hi = lo + window
+        depth = min(sieve_limit, max(1000, 4 * hi))
+        flags = bytearray([1]) * window
+        for q in primes:
+            if q > depth:
+                break
+            target = -sign % q
+            t = pow(2, lo, q)
+            u = lo * t % q
+            for i in range(window):
+                if u == target:
+                    flags[i] = 0
+                u = (u + t) * 2 % q
+                t = t * 2 % q
+        for i in range(window):
+            k = lo + i
+            # The few candidates that are themselves one of the q
+            if flags[i] or ((k << k) + sign <= depth and
+                            is_prime((k << k) + sign)):
+                yield k
+        lo = hi
+
+
+def _special_prime_task(task):
+    """(k, whether the `family` number of index k is prime) for a task
+    (family, k) of `_special_primes`
+    """
+    family, k = task
+    if family == "mersenne":
+        return k, lucas_lehmer(k)
+    h, n = _split_power_of_two(k, k)
+    if family == "woodall":
+        return k, _is_riesel_prime(h, n)
+    return k, _is_proth_prime(h, n)
+
+
+def _special_primes(family, candidates, mapper=map, tasks_per_round=1):
+    """The indices among `candidates` whose `family` number is prime,
+    ascending. Candidates go to `mapper` `tasks_per_round` at a time and
+    a round is sorted before it is yielded, as in `sieve_segments`.
+    """
+    candidates = iter(candidates)
+    while True:
+        tasks = []
+        for k in candidates:
+            tasks.append((family, k))
+            if len(tasks) >= tasks_per_round:
+                break
+        if not tasks:
+            return
+        for k, prime in sorted(mapper(_special_prime_task, tasks)):
+            if prime:
+                yield k
+
+
+def mersenne_primes(mapper=map, tasks_per_round=1, sieve_limit=1 << 16):
+    """Generate the Mersenne primes 2^p - 1 in ascending order, lazily and
+    without end: prime exponents p whose candidate has no small factor of
+    the form 2mp + 1 go to the Lucas-Lehmer test. The exponent of each is
+    its bit length. More info at https://oeis.org/A000668
+    Args:
+        mapper (callable): `map`-like function running the tests, e.g. a
+            process pool's `imap_unordered` (see `parallel.mersenne_primes`)
+        tasks_per_round (int): exponents handed to `mapper` at a time
+        sieve_limit (int): least bound of the trial factors tried
+    Yields:
+        (int): 3, 7, 31, 127, 8191, ...
+    """
+    for p in _special_primes("mersenne", _mersenne_exponents(sieve_limit),
+                             mapper, tasks_per_round):
+        yield (1 << p) - 1
+
+
+def perfect_numbers(mapper=map, tasks_per_round=1, sieve_limit=1 << 16):
+    """Generate the even perfect numbers 2^(p - 1) * (2^p - 1) in ascending
+    order, one per Mersenne prime from `mersenne_primes`, which takes the
+    same arguments; no odd one is known. More info at
+    https://oeis.org/A000396
+    Yields:
+        (int): 6, 28, 496, 8128, 33550336, ...
+    """
+    for m in mersenne_primes(mapper, tasks_per_round, sieve_limit):
+        yield (m + 1) // 2 * m
+
+
+def woodall_primes(mapper=map, tasks_per_round=1, sieve_limit=1 << 16):
+    """Generate the Woodall primes k * 2^k - 1 in ascending order, lazily
+    and without end: indices k are presieved by the primes up to
+    `sieve_limit` and the survivors go to the Lucas-Lehmer-Riesel test.
+    More info at https://oeis.org/A050918
+    Args:
+        mapper (callable): `map`-like function running the tests, e.g. a
+            process pool's `imap_unordered` (see `parallel.woodall_primes`)
+        tasks_per_round (int): indices handed to `mapper` at a time
+        sieve_limit (int): bound of the primes sieved by
+    Yields:
+        (int): 7, 23, 383, 32212254719, ...
+    """
+    for k in _special_primes("woodall",
+                             _cullen_woodall_candidates(-1, sieve_limit),
+                             mapper, tasks_per_round):
+        yield (k << k) - 1
+
+
+def cullen_primes(mapper=map, tasks_per_round=1, sieve_limit=1 << 16):
+    """Generate the Cullen primes k * 2^k + 1 in ascending order as
+    `woodall_primes` does, with Proth's theorem as the final test. More
+    info at https://oeis.org/A050920
+    Yields:
+        (int): 3, 141 * 2^141 + 1, 4713 * 2^4713 + 1, ...
+    """
+    for k in _special_primes("cullen",
+                             _cullen_woodall_candidates(1, sieve_limit),
+                             mapper, tasks_per_round):
+        yield (k << k) + 1
+
+
+def verify_goldbach_block(lo, hi, small_limit=1 << 14, record=False):
+    """Find the minimal Goldbach prime p (the smallest prime with n - p
+    prime) of every even n in [`lo`, `hi`). One odd-only segment covering
+    [lo - small_limit, hi) is sieved; then for each small prime p the flags
+    of n - p for all n of the block form one contiguous slice, which is
+    ANDed as a big int with the mask of still unresolved n, so the work per
+    prime happens in C. The rare n left over go on through the base primes
+    of that sieve above `small_limit`, testing n - p with `is_prime`, and
+    only past those to `Integer.minimal_goldbach_partition`.
+    Args:
+        lo (int): inclusive lower bound of the block
+        hi (int): exclusive upper bound of the block
+        small_limit (int): largest p tried on the sieve
+        record (bool): also return the minimal prime of every even n
+    Returns:
+        (dict): "lo", "hi", "checked" (number of even n >= 4 verified),
+            "max_prime" and "max_at" (the largest minimal prime and the
+            first n having it), "counts" ({p: number of n whose minimal
+            prime is p}), "counterexamples" (n without a partition) and,
+            if `record`, "minimal" (the minimal primes as little-endian
+            16-bit lanes, one per even n from the first even n >= lo; 0
+            marks n < 4 and any counterexample)
+    """
+    result = {"lo": lo, "hi": hi, "checked": 0, "max_prime": 0,
+              "max_at": None, "counts": {}, "counterexamples": []}
+    start = max(lo + (lo & 1), 4)
+    minimal = {}
+
+    def resolve(n, p):
+        result["checked"] += 1
+        result["counts"][p] = result["counts"].get(p, 0) + 1
+        if p > result["max_prime"] or \
+                (p == result["max_prime"] and n < result["max_at"]):
+            result["max_prime"], result["max_at"] = p, n
+        if record:
+            minimal[n] = p
+
+    # Small n, where n - p could leave the sieved segment, one at a time
+    vectorized = max(start, 2 * small_limit + 2)
+    if start < min(hi, vectorized):
+        small = _primes_up_to(vectorized)
+        members = set(small)
+        for n in range(start, min(hi, vectorized), 2):
+            for p in small:
+                if 2 * p > n:
+                    result["counterexamples"].append(n)
+                    break
+                if n - p in members:
+                    resolve(n, p)
+                    break
+
+    lanes = b""
+    count = (hi - vectorized + 1) >> 1
+    if count > 0:
+        base, base_primes = vectorized - small_limit, _primes_up_to(_isqrt(hi))
+        first, flags = _sieve_segment(base, hi, base_primes[1:])
+        unresolved = int.from_bytes(b"\x01" * count, "little")
+        low = high = 0
+        for p in _primes_up_to(small_limit)[1:]:
+            offset = (vectorized - p - first) >> 1
+            hits = int.from_bytes(flags[offset:offset + count], "little")
+            new = unresolved & hits
+            if not new:
+                continue
+            unresolved ^= new
+            resolved = new.to_bytes(count, "little")
+            found = resolved.count(1)
+            result["checked"] += found
+            result["counts"][p] = result["counts"].get(p, 0) + found
+            if p > result["max_prime"]:
+                result["max_prime"] = p
+                result["max_at"] = vectorized + 2 * resolved.find(1)
+            if record:
+                low += new * (p & 0xFF)
+                high += new * (p >> 8)
+            if not unresolved:
+                break
+        if unresolved:
+            leftover = unresolved.to_bytes(count, "little")
+            above = [p for p in base_primes if p > small_limit]
+            i = leftover.find(1)
+            while i != -1:
+                n = vectorized + 2 * i
+                for p in above:
+                    if 2 * p > n:
+                        partition = None
+                        break
+                    if is_prime(n - p):
+                        partition = (p, n - p)
+                        break
+                else:
+                    partition = Integer(n).minimal_goldbach_partition()
+                if partition:
+                    resolve(n, partition[0])
+                    if record:
+                        low += (partition[0] & 0xFF) << (8 * i)
+                        high += (partition[0] >> 8) << (8 * i)
+                else:
+                    result["counterexamples"].append(n)
+                i = leftover.find(1, i + 1)
+        if record:
+            low, high = low.to_bytes(count, "little"), \
+                high.to_bytes(count, "little")
+            lanes = bytearray(2 * count)
+            lanes[0::2], lanes[1::2] = low, high
+
+    if record:
+        head = bytearray()
+        for n in range(lo + (lo & 1), min(hi, vectorized), 2):
+            p = minimal.get(n, 0)
+            head += bytes((p & 0xFF, p >> 8))
+        result["minimal"] = bytes(head + lanes)
+    return result
+
+
+def _verify_goldbach_task(task):
+    return verify_goldbach_block(*task)
+
+
+def verify_goldbach(lo, hi, block_size=1 << 22, mapper=map,
+                    small_limit=1 << 14, on_block=None):
+    """Verify Goldbach's conjecture for every even n in [`lo`, `hi`), one
+    block of `block_size` integers at a time, by `verify_goldbach_block`.
+    Args:
+        lo (int): inclusive lower bound
+        hi (int): exclusive upper bound
+        block_size (int): integers per block; memory per block is a small
+            multiple of this many bytes
+        mapper (callable): `map`-like function running the blocks, e.g. a
+            process pool's `imap` (see `parallel.verify_goldbach`)
+        small_limit (int): passed to `verify_goldbach_block`
+        on_block (callable): if given, called with every block's result as
+            it arrives, with the minimal primes recorded
+    Returns:
+        (dict): totals over the whole range: "checked", "max_prime",
+            "max_at", "counts" and "counterexamples"
+    """
+    if block_size < 2:
+        raise ValueError("Block size must be at least 2")
+    block_size += block_size & 1
+    tasks = ((start, min(start + block_size, hi), small_limit,
+              on_block is not None)
+             for start in range(lo, hi, block_size))
+    summary = {"lo": lo, "hi": hi, "checked": 0, "max_prime": 0,
+               "max_at": None, "counts": {}, "counterexamples": []}
+    for block in mapper(_verify_goldbach_task, tasks):
+        if on_block is not None:
+            on_block(block)
+        summary["checked"] += block["checked"]
+        for p, count in block["counts"].items():
+            summary["counts"][p] = summary["counts"].get(p, 0) + count
+        summary["counterexamples"].extend(block["counterexamples"])
+        if block["max_prime"] > summary["max_prime"] or \
+                (block["max_prime"] == summary["max_prime"] and
+                 block["max_at"] is not None and
+                 block["max_at"] < summary["max_at"]):
+            summary["max_prime"] = block["max_prime"]
+            summary["max_at"] = block["max_at"]
+    summary["counts"] = {p: summary["counts"][p]
+                         for p in sorted(summary["counts"])}
+    summary["counterexamples"].sort()
+    return summary
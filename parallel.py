@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Process-pool front ends for the number theory in `integer`.
+
+`integer` itself imports nothing, so its expensive loops take a `map`-like
+`mapper` argument instead of managing processes; the functions here supply
+one backed by a `multiprocessing` pool.
+"""
+
+import multiprocessing
+import os
+import queue
+
+import integer
+import primetable
+
+
+def _process_count(processes):
+    return processes or os.cpu_count() or 1
+
+
+def _pool(processes):
+    """A pool of `processes` workers, each mapping the prime table file
+    loaded here, if any, so they share its pages instead of sieving
+    """
+    table = primetable.current()
+    if table is None:
+        return multiprocessing.Pool(processes)
+    return multiprocessing.Pool(processes, initializer=primetable.load,
+                                initargs=(table.path, False))
+
+
+def siqs(n, processes=None):
+    """`integer.siqs` with the sieving spread over `processes` workers
+    (default: one per core)
+    Args:
+        n (int): composite integer, not a prime power
+        processes (int): number of worker processes
+    Returns:
+        (int): a non-trivial factor of `n`
+    """
+    processes = _process_count(processes)
+    with _pool(processes) as pool:
+        return integer.siqs(n, mapper=pool.imap_unordered,
+                            tasks_per_round=2 * processes)
+
+
+def factorize(n, processes=None):
+    """`integer.factorize` whose quadratic sieve stage, if reached, runs on
+    `processes` workers (default: one per core)
+    """
+    processes = _process_count(processes)
+    with _pool(processes) as pool:
+        return integer.factorize(n, mapper=pool.imap_unordered,
+                                 tasks_per_round=2 * processes)
+
+
+def factor_many(values, processes=None, chunk_size=256, hard_bits=64,
+                ordered=True, max_pending=None):
+    """`integer.factor_many` over `processes` workers (default: one per
+    core), with back-pressure: no more tasks are sent while `max_pending`
+    numbers are out or waiting to be yielded, so memory stays flat however
+    long `values` is. The pool lives as long as the generator.
+    Args:
+        values (iterable): the integers, consumed as results are taken
+        processes (int): number of worker processes
+        chunk_size (int): numbers per task below `hard_bits`
+        hard_bits (int): size above which a number is a task of its own
+        ordered (bool): yield in the order of `values` rather than as
+            tasks finish, as `integer.factor_many` does by default
+        max_pending (int): numbers in flight or held for ordering at most,
+            beyond one task (default: 8 chunks per worker)
+    Yields:
+        (tuple): (n, {prime: exponent}), {} for n < 2
+    """
+    processes = _process_count(processes)
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+    if max_pending is None:
+        max_pending = 8 * processes * chunk_size
+    if max_pending < 1:
+        raise ValueError("Pending limit must be positive")
+    tasks = integer._factor_tasks(values, chunk_size, hard_bits)
+    done = queue.Queue()
+    # Numbers sent and not yet yielded; tasks come in index order, so the
+    # next one to yield in order has always been sent
+    pending, waiting, expected = 0, {}, 0
+    with _pool(processes) as pool:
+        task = next(tasks, None)
+        while task is not None or pending:
+            while task is not None and pending < max_pending:
+                pool.apply_async(integer._factor_task, (task,),
+                                 callback=done.put, error_callback=done.put)
+                pending += len(task)
+                task = next(tasks, None)
+            result = done.get()
+            if isinstance(result, BaseException):
+                raise result
+            if not ordered:
+                for _, n, factors in result:
+                    pending -= 1
+                    yield n, factors
+                continue
+            for i, n, factors in result:
+                waiting[i] = n, factors
+            while expected in waiting:
+                pending -= 1
+                yield waiting.pop(expected)
+                expected += 1
+
+
+def verify_goldbach(lo, hi, processes=None, memory_budget=1 << 28,
+                    block_size=None, on_block=None):
+    """`integer.verify_goldbach` with the blocks spread over `processes`
+    workers (default: one per core). Blocks come back unordered and are
+    folded into the summary as they arrive, so only the blocks in flight
+    are ever held in memory.
+    Args:
+        lo (int): inclusive lower bound
+        hi (int): exclusive upper bound
+        processes (int): number of worker processes
+        memory_budget (int): bytes the workers may use between them; a
+            block of b integers takes about 6*b bytes while it is sieved
+        block_size (int): integers per block, overriding `memory_budget`
+        on_block (callable): called with every block's result, including
+            its recorded minimal primes, in completion order
+    Returns:
+        (dict): as `integer.verify_goldbach`
+    """
+    processes = _process_count(processes)
+    if block_size is None:
+        block_size = max(memory_budget // (6 * processes), 1 << 16)
+        # Enough blocks to keep every worker busy until the end
+        block_size = min(block_size, -(-(hi - lo) // (4 * processes)))
+    with _pool(processes) as pool:
+        return integer.verify_goldbach(lo, hi, block_size=max(block_size, 2),
+                                       mapper=pool.imap_unordered,
+                                       on_block=on_block)
+
+
+def sieve_segments(lo, hi, processes=None, segment_size=1 << 21,
+                   summary=False):
+    """`integer.sieve_segments` with the segments sieved by `processes`
+    workers (default: one per core) and handed back in ascending order.
+    The pool lives as long as the generator.
+    Args:
+        lo (int): inclusive lower bound
+        hi (int): exclusive upper bound
+        processes (int): number of worker processes
+        segment_size (int): integers per segment
+        summary (bool): give each segment's prime count and sum instead
+            of its primes
+    Yields:
+        (tuple): as `integer.sieve_segments`
+    """
+    processes = _process_count(processes)
+    # Sieved before the pool starts, so forked workers inherit them
+    integer._sieve_base_primes(integer._isqrt(max(hi - 1, 0)))
+    with _pool(processes) as pool:
+        for segment in integer.sieve_segments(
+                lo, hi, segment_size, mapper=pool.imap_unordered,
+                tasks_per_round=4 * processes, summary=summary):
+            yield segment
+
+
+def sieve_primes(lo, hi, processes=None, segment_size=1 << 21):
+    """The primes in [`lo`, `hi`), ascending, sieved as `sieve_segments`
+    """
+    for _, _, primes in sieve_segments(lo, hi, processes, segment_size):
+        for p in primes:
+            yield p
+
+
+def _special_primes(generate, processes, sieve_limit):
+    processes = _process_count(processes)
+    with _pool(processes) as pool:
+        for n in generate(mapper=pool.imap_unordered,
+                          tasks_per_round=processes, sieve_limit=sieve_limit):
+            yield n
+
+
+def mersenne_primes(processes=None, sieve_limit=1 << 16):
+    """`integer.mersenne_primes` with `processes` exponents tested at a
+    time (default: one per core). The pool lives as long as the generator.
+    """
+    return _special_primes(integer.mersenne_primes, processes, sieve_limit)
+
+
+def perfect_numbers(processes=None, sieve_limit=1 << 16):
+    """`integer.perfect_numbers` from `mersenne_primes`
+    """
+    return _special_primes(integer.perfect_numbers, processes, sieve_limit)
+
+
+def woodall_primes(processes=None, sieve_limit=1 << 16):
+    """`integer.woodall_primes` with `processes` indices tested at a time
+    (default: one per core). The pool lives as long as the generator.
+    """
+    return _special_primes(integer.woodall_primes, processes, sieve_limit)
+
+
+def cullen_primes(processes=None, sieve_limit=1 << 16):
+    """`integer.cullen_primes` with `processes` indices tested at a time
+    (default: one per core). The pool lives as long as the generator.
+    """
+    return _special_primes(integer.cullen_primes, processes, sieve_limit)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""On-disk prime tables for `integer`, memory-mapped read-only so that every
+process using the same file shares one copy of its pages.
+
+A table file is a 64-byte header followed by a bitmap of the odd numbers up
+to the table's bound, bit j of byte k set if and only if 16k + 2j + 1 is
+prime, padded to whole blocks of `BLOCK_BYTES`, then the number of set bits
+before each block as little-endian 64-bit integers. The header holds the
+magic, the format version, the block size, the bound, pi(bound), the
+bitmap's length and the CRC-32 of everything after the header.
+
+    python primetable.py build primes.bin 1000000000
+    python primetable.py info primes.bin
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import zlib
+
+import integer
+
+MAGIC = b"PRIMETBL"
+VERSION = 1
+HEADER_SIZE = 64
+# Bitmap bytes per block: pi(n) counts the bits of at most one block
+BLOCK_BYTES = 512
+_HEADER = struct.Struct("<8sIIQQQI")
+# _SPREAD[j] maps a sieve flag (0 or 1) to bit j, _BIT[j] a byte to its bit j
+_SPREAD = [bytes([0, 1 << j]) + bytes(254) for j in range(8)]
+_BIT = [bytes((b >> j) & 1 for b in range(256)) for j in range(8)]
+
+_current = None
+
+
+def _pack(flags):
+    """Pack a bytearray of 0/1 flags, a multiple of 8 long, into bits
+    """
+    packed = 0
+    for j in range(8):
+        packed |= int.from_bytes(flags[j::8].translate(_SPREAD[j]), "little")
+    return packed.to_bytes(len(flags) >> 3, "little")
+
+
+def _unpack(bits):
+    """The 0/1 flags of the bits of `bits`, as `_pack` takes them
+    """
+    bits = bytes(bits)
+    flags = bytearray(len(bits) << 3)
+    for j in range(8):
+        flags[j::8] = bits.translate(_BIT[j])
+    return flags
+
+
+def build(path, limit, segment_size=1 << 24):
+    """Sieve the primes up to `limit` and write them to a table file at
+    `path`, replacing it only once the new file is complete
+    Args:
+        path (str): file to write
+        limit (int): inclusive bound of the table, at least 2
+        segment_size (int): integers sieved at a time, which bounds the
+            memory used
+    Returns:
+        (int): the number of primes written, pi(`limit`)
+    """
+    if limit < 2:
+        raise ValueError("A prime table needs a bound of at least 2")
+    # Segments start on block boundaries so blocks are counted whole
+    span = 16 * BLOCK_BYTES
+    segment_size = max(segment_size // span, 1) * span
+    base_primes = integer._primes_up_to(integer._isqrt(limit))[1:]
+    counts, running, checksum = [], 0, 0
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(bytes(HEADER_SIZE))
+        for lo in range(0, limit + 1, segment_size):
+            hi = min(lo + segment_size, limit + 1)
+            _, flags = integer._sieve_segment(lo, hi, base_primes)
+            # Pad the last segment with zeros up to a whole block
+            flags.extend(bytes(-len(flags) % (8 * BLOCK_BYTES)))
+            bits = _pack(flags)
+            for start in range(0, len(bits), BLOCK_BYTES):
+                counts.append(running)
+                running += flags.count(1, 8 * start,
+                                       8 * (start + BLOCK_BYTES))
+            handle.write(bits)
+            checksum = zlib.crc32(bits, checksum)
+        tail = struct.pack("<{}Q".format(len(counts)), *counts)
+        handle.write(tail)
+        checksum = zlib.crc32(tail, checksum)
+        handle.seek(0)
+        handle.write(_HEADER.pack(MAGIC, VERSION, BLOCK_BYTES, limit,
+                                  running + 1, len(counts) * BLOCK_BYTES,
+                                  checksum))
+    os.replace(temporary, path)
+    return running + 1
+
+
+class PrimeTable(object):
+    """A table file mapped read-only. It answers `integer.use_prime_table`'s
+    questions for 0 <= n <= `limit`; `load` hands it over.
+    """
+
+    def __init__(self, path, verify=True):
+        """
+        Args:
+            path (str): table file written by `build`
+            verify (bool): check the CRC-32, which reads the whole file
+        """
+        self.path = path
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header(verify)
+        except BaseException:
+            self._map.close()
+            raise
+
+    def _read_header(self, verify):
+        if len(self._map) < HEADER_SIZE:
+            raise ValueError("{} is too short for a prime table"
+                             .format(self.path))
+        magic, version, block_bytes, self.limit, self.count, bitmap_bytes, \
+            checksum = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError("{} is not a prime table".format(self.path))
+        if version != VERSION:
+            raise ValueError("{} has version {}, not {}".format(
+                self.path, version, VERSION))
+        # Blocks of the expected size, so a corrupt block size of 0 is
+        # reported below rather than divided by
+        blocks = bitmap_bytes // BLOCK_BYTES
+        if block_bytes != BLOCK_BYTES or \
+                len(self._map) != HEADER_SIZE + bitmap_bytes + 8 * blocks or \
+                bitmap_bytes < (self.limit + 15) >> 4:
+            raise ValueError("{} is truncated or malformed"
+                             .format(self.path))
+        view = memoryview(self._map)
+        self._bits = view[HEADER_SIZE:HEADER_SIZE + bitmap_bytes]
+        self._counts = view[HEADER_SIZE + bitmap_bytes:]
+        view.release()
+        if verify and \
+                zlib.crc32(self._counts, zlib.crc32(self._bits)) != checksum:
+            self.close()
+            raise ValueError("{} fails its checksum".format(self.path))
+
+    def __repr__(self):
+        return "PrimeTable({!r})".format(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def nbytes(self):
+        """Size of the mapped file
+        """
+        return len(self._map)
+
+    def close(self):
+        """Unmap the file; the table cannot be used afterwards
+        """
+        if not self._map.closed:
+            self._bits.release()
+            self._counts.release()
+            self._map.close()
+
+    def is_prime(self, n):
+        """Whether 0 <= `n` <= `limit` is prime
+        """
+        if not n & 1:
+            return n == 2
+        i = n >> 1
+        return bool(self._bits[i >> 3] >> (i & 7) & 1)
+
+    def pi(self, n):
+        """The number of primes <= `n`, for `n` <= `limit`
+        """
+        if n < 2:
+            return 0
+        i = (n - 1) >> 1
+        block = i // (8 * BLOCK_BYTES)
+        start = block * BLOCK_BYTES
+        bits = int.from_bytes(self._bits[start:(i >> 3) + 1], "little")
+        bits &= (2 << (i - 8 * start)) - 1
+        before, = struct.unpack_from("<Q", self._counts, 8 * block)
+        return 1 + before + bin(bits).count("1")
+
+    def primes(self, lo, hi):
+        """The primes in [`lo`, `hi`), ascending, for `hi` <= `limit` + 1
+        """
+        primes = [2] if lo <= 2 < hi else []
+        # Odd 2i + 1 lies in [lo, hi) for lo >> 1 <= i < hi >> 1
+        a, c = max(lo, 0) >> 1, max(hi, 0) >> 1
+        if a >= c:
+            return primes
+        base = a & ~7
+        flags = _unpack(self._bits[base >> 3:(c + 7) >> 3])
+        i, stop = flags.find(1, a - base, c - base), c - base
+        while i != -1:
+            primes.append(2 * (base + i) + 1)
+            i = flags.find(1, i + 1, stop)
+        return primes
+
+
+def load(path, verify=True):
+    """Map the table file at `path` and have `integer` consult it
+    Returns:
+        (PrimeTable)
+    """
+    global _current
+    table = PrimeTable(path, verify)
+    integer.use_prime_table(table)
+    if _current is not None:
+        _current.close()
+    _current = table
+    return table
+
+
+def unload():
+    """Stop `integer` consulting the table `load` gave it, and unmap it
+    """
+    global _current
+    if _current is not None:
+        integer.use_prime_table(None)
+        _current.close()
+        _current = None
+
+
+def current():
+    """The table `load` handed to `integer`, or None
+    """
+    return _current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    builder = commands.add_parser("build", help="write a table file")
+    builder.add_argument("path")
+    builder.add_argument("limit", type=int)
+    builder.add_argument("--segment-size", type=int, default=1 << 24)
+    info = commands.add_parser("info", help="check a table file")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        count = build(args.path, args.limit, args.segment_size)
+        print("{} primes up to {} written to {}".format(
+            count, args.limit, args.path))
+    else:
+        with PrimeTable(args.path) as table:
+            print("{}: version {}, {} primes up to {}, {} bytes".format(
+                args.path, VERSION, table.count, table.limit, table.nbytes))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,26 @@ import itertools as it
 import math
 import operator
 import string
+import sys
 from functools import reduce
 
-from hypothesis import given, strategies as st
+from hypothesis import given, settings, strategies as st
 import more_itertools as mit
 import pytest as pt
 
-from integer import is_prime, Integer, sequence, generate_primes
+import integer
+from integer import (is_prime, Integer, sequence, generate_primes, factorize,
+                     siqs, LRUCache, factorization_cache, prime_count,
+                     prime_sum, set_pi_table_limit, verify_goldbach_block,
+                     verify_goldbach, factorial, factorial_decomposition,
+                     binomial, multinomial, lucas_lehmer, next_prime,
+                     prev_prime, highly_composite_numbers,
+                     largely_composite_numbers,
+                     superior_highly_composite_numbers, nth_most_divisors,
+                     IntegerRange, set_spf_table_limit, spf_table_stats,
+                     sieve_segments, sieve_primes, factor_many,
+                     instrumentation, mersenne_primes, perfect_numbers,
+                     woodall_primes, cullen_primes)
 
 # Maybe make a fixture here that takes a given logic, e.g. is_woodall, and a max
 # value that Hypothesis takes, and return all the examples up to that number.
@@ -19,6 +32,27 @@ from integer import is_prime, Integer, sequence, generate_primes
 # pytest.ini and adhere to that.
 
 
+def count_factorize_calls(mp):
+    """Have `mp` wrap `integer.factorize` so that every number it is asked
+    to factor is appended to the returned list
+    """
+    calls, factorize = [], integer.factorize
+
+    def counting_factorize(n):
+        calls.append(n)
+        return factorize(n)
+
+    mp.setattr(integer, "factorize", counting_factorize)
+    return calls
+
+
+def shuffled(function, tasks):
+    """A `map` yielding its results in reverse, like a pool whose tasks
+    finish out of order
+    """
+    return reversed(list(map(function, tasks)))
+
+
 # HELPERS TESTS #
 @given(st.integers(min_value=0))
 def test_sequence(maximum):
@@ -42,6 +76,67 @@ def test_generate_primes(how_many):
         assert is_prime(next(primes))
 
 
+@given(st.integers(max_value=1e5), st.integers(min_value=2, max_value=1e3))
+def test_generate_primes_from_start(start, segment_size):
+    expected = [p for p in range(start, start + 2000) if is_prime(p)]
+    primes = generate_primes(start, segment_size=segment_size)
+    assert list(it.islice(primes, len(expected))) == expected
+
+
+def test_generate_primes_invalid_segment_size():
+    with pt.raises(ValueError):
+        next(generate_primes(segment_size=1))
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put(1, "a")
+    cache.put(2, "b")
+    assert cache.get(1) == "a"
+    cache.put(3, "c")
+    assert 2 not in cache and 1 in cache and 3 in cache
+    assert cache.get(2) is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 1,
+                             "size": 2, "maxsize": 2}
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == cache.misses == 0
+
+
+def test_factorization_cache_reuses_known_divisor():
+    factorization_cache.clear()
+    a = 1000000000039 * 1000000000000037
+    factorize(a)
+    assert factorization_cache.misses == 1
+    assert factorize(-a) == factorize(a)
+    assert factorization_cache.hits == 2
+    k = 1000000007 * 998244353
+    assert factorize(4 * a * k) == {2: 2, 998244353: 1, 1000000007: 1,
+                                    1000000000039: 1, 1000000000000037: 1}
+    assert factorization_cache.partial_hits == 1
+
+
+def test_factorization_cache_skips_trial_division_results():
+    factorization_cache.clear()
+    factorization_cache.resize(16)
+    try:
+        a = 1000000000039 * 1000000000000037
+        factorize(a)
+        for n in range(10**6, 10**6 + 1000):
+            factorize(n)
+        assert a in factorization_cache and len(factorization_cache) == 1
+    finally:
+        factorization_cache.resize(1 << 16)
+
+
+def test_factorization_cache_forgets_evicted_primes():
+    cache = integer.FactorizationCache(maxsize=1)
+    cache.put(10007 * 10009, {10007: 1, 10009: 1})
+    assert cache.known_divisor(3 * 10009) == (10009, {10009: 1})
+    cache.put(10037, {10037: 1})
+    assert cache.known_divisor(3 * 10009) is None
+    assert cache.known_divisor(10037 ** 2 * 7) == (10037 ** 2, {10037: 2})
+
+
 # INIT TEST #
 @given(st.integers())
 def test_init_integer(z):
@@ -226,6 +321,43 @@ def test_is_prime_false_for_any_integer_not_ending_in_1379(z):
             assert not is_prime(z)
 
 
+@given(st.integers(max_value=1e6))
+def test_is_prime_agrees_with_trial_division(z):
+    expected = z > 1 and all(z % d for d in range(2, math.isqrt(z) + 1))
+    assert is_prime(z) == expected
+
+
+@pt.mark.parametrize("z", [2**61 - 1, 2**89 - 1, 2**127 - 1, 2**521 - 1,
+                           10**30 + 57])
+def test_is_prime_large_primes(z):
+    assert is_prime(z)
+
+
+@pt.mark.parametrize("z", [3317044064679887385961981,  # psp to bases <= 37
+                           (2**61 - 1) * (2**89 - 1),
+                           (2**127 - 1) ** 2,
+                           2**128 + 1])
+def test_is_prime_large_composites(z):
+    assert not is_prime(z)
+
+
+@pt.mark.parametrize("z", [-7, 0, 1, 2, 997, 999, 997 * 997, 1009 * 1009,
+                           1000003, 10000019, 10000021, 2**52 + 1,
+                           2**53 - 111])
+def test_is_prime_takes_integral_floats(z):
+    # Both sides of the trial division cutoff at 1000^2
+    assert is_prime(float(z)) == is_prime(z)
+
+
+def test_is_prime_rejects_non_integers():
+    with pt.raises(ValueError):
+        is_prime(7.5)
+    with pt.raises(ValueError):
+        is_prime(float("inf"))
+    with pt.raises(TypeError):
+        is_prime("7")
+
+
 # PROPERTY TEST #
 @given(st.integers())
 def test_binary(z):
@@ -239,6 +371,46 @@ def test_decomposition(z):
                        (k**v for k, v in Integer(z).decomposition.items()))
 
 
+@given(st.integers(min_value=2, max_value=2**80))
+def test_decomposition_is_exact_and_prime(z):
+    decomposition = Integer(z).decomposition
+    assert all(is_prime(p) for p in decomposition)
+    assert list(decomposition) == sorted(decomposition)
+    assert z == reduce(operator.mul, (p**e for p, e in decomposition.items()))
+
+
+@pt.mark.parametrize("factors", [
+    {617326624931: 1, 935351532923: 1},  # rho
+    {59649589127497217: 1, 5704689200685129054721: 1},  # 2**128 + 1, ECM
+    {3: 4, 2**61 - 1: 2, 1000003: 1},
+])
+def test_decomposition_large(factors):
+    z = reduce(operator.mul, (p**e for p, e in factors.items()))
+    assert Integer(z).decomposition == factors
+    assert factorize(-z) == factors
+
+
+@pt.mark.parametrize("p, q", [
+    (100000000000000000039, 1000000000000000000117),
+    (10000000000000000051, 10000000000000000000009),
+])
+def test_siqs(p, q):
+    assert siqs(p * q) in (p, q)
+    assert Integer(p * q).decomposition == {p: 1, q: 1}
+
+
+def test_siqs_rejects_primes():
+    with pt.raises(ValueError):
+        siqs(2**61 - 1)
+
+
+def test_siqs_rejects_empty_rounds():
+    for tasks_per_round in (0, -1):
+        with pt.raises(ValueError):
+            siqs((10**12 + 39) * (10**12 + 61),
+                 tasks_per_round=tasks_per_round)
+
+
 @given(st.integers(max_value=1e4))
 def test_divisors(z):
     # Using itertools, take Integer.decomposition and get every
@@ -251,6 +423,23 @@ def test_divisors(z):
                                    if z % x == 0}
 
 
+@given(st.integers(max_value=1e4), st.integers(max_value=1e4))
+def test_iter_divisors(z, bound):
+    expected = [d for d in range(1, z + 1) if z % d == 0]
+    assert list(Integer(z).iter_divisors()) == expected
+    bounded = [d for d in expected if d <= bound]
+    assert list(Integer(z).iter_divisors(bound)) == bounded
+    assert Integer(z).count_divisors(bound) == len(bounded)
+    assert Integer(z).count_divisors() == Integer(z).tau
+
+
+def test_iter_divisors_streams_large_divisor_counts():
+    Z = Integer(2**4 * 3**4 * 5**4 * 7**3 * 11**2 * 13 * 17 * 19 * 23)
+    divisors = Z.iter_divisors()
+    assert list(it.islice(divisors, 10)) == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    assert sum(1 for _ in divisors) == Z.tau - 10
+
+
 @given(st.integers(max_value=1e4))
 def test_euler_totient(z):
     # Euler's product formula
@@ -263,6 +452,24 @@ def test_euler_totient(z):
                        z))
 
 
+@given(st.integers(max_value=60), st.integers(min_value=1, max_value=3))
+def test_jordan_totient(z, k):
+    expected = sum(1 for t in it.product(range(1, z + 1), repeat=k)
+                   if math.gcd(z, *t) == 1) if z > 0 else 0
+    assert Integer(z).jordan_totient(k) == expected
+
+
+@given(st.integers(max_value=1e3))
+def test_carmichael(z):
+    if z < 1:
+        assert Integer(z).carmichael == 0
+    else:
+        units = [a for a in range(1, z + 1) if math.gcd(a, z) == 1]
+        order = next(m for m in it.count(1)
+                     if all(pow(a, m, z) == 1 % z for a in units))
+        assert Integer(z).carmichael == order
+
+
 @given(st.integers(max_value=1e2))
 def test_factorial(z):
     if z < 0:
@@ -274,6 +481,64 @@ def test_factorial(z):
         assert Integer(z).factorial == math.factorial(z)
 
 
+def test_factorial_beyond_recursion_limit():
+    z = Integer(5000).factorial
+    assert z == math.factorial(5000)
+    assert z.decomposition == factorize(math.factorial(5000))
+    assert z.tau == Integer(math.factorial(5000)).tau
+
+
+@given(st.integers(max_value=1e3))
+def test_factorial_decomposition(z):
+    if z < 0:
+        with pt.raises(ValueError):
+            factorial_decomposition(z)
+    else:
+        assert factorial_decomposition(z) == factorize(math.factorial(z))
+        assert factorial(z) == math.factorial(z)
+
+
+@given(st.integers(max_value=300), st.integers(min_value=-5, max_value=300))
+def test_binomial(n, k):
+    if n < 0:
+        with pt.raises(ValueError):
+            binomial(n, k)
+    else:
+        assert binomial(n, k) == (math.comb(n, k) if k >= 0 else 0)
+
+
+def test_binomial_with_small_k():
+    assert binomial(10**8, 3) == math.comb(10**8, 3)
+    assert binomial(10**8, 10**8 - 40) == math.comb(10**8, 40)
+    assert multinomial(10**8, 2, 1) == 3 * math.comb(10**8 + 3, 3)
+
+
+@given(st.lists(st.integers(min_value=0, max_value=60), max_size=5))
+def test_multinomial(counts):
+    assert multinomial(*counts) == \
+        math.factorial(sum(counts)) // \
+        reduce(operator.mul, map(math.factorial, counts), 1)
+
+
+@given(st.lists(st.integers(min_value=-10, max_value=2 ** 70), max_size=40),
+       st.integers(min_value=1, max_value=8), st.booleans())
+def test_factor_many(values, chunk_size, ordered):
+    tasks = list(integer._factor_tasks(values, chunk_size, hard_bits=40))
+    assert [i for task in tasks for i, _ in task] == list(range(len(values)))
+    assert all(len(task) == 1 or all(n.bit_length() <= 40 for _, n in task)
+               for task in tasks)
+    assert all(len(task) <= chunk_size for task in tasks)
+
+    expected = [(n, Integer(n).decomposition) for n in values]
+    results = list(factor_many(iter(values), mapper=shuffled,
+                               chunk_size=chunk_size, hard_bits=40,
+                               ordered=ordered))
+    if ordered:
+        assert results == expected
+    else:
+        assert sorted(results, key=repr) == sorted(expected, key=repr)
+
+
 @given(st.integers(max_value=1e4))
 def test_factorization(z):
     assert Integer(z).factorization == \
@@ -293,6 +558,54 @@ def test_goldbach_partitions(z):
         assert Integer(z).goldbach_partitions == expected
 
 
+@given(st.integers(max_value=1e4))
+def test_goldbach_partition_modes(z):
+    expected = sorted(Integer(z).goldbach_partitions)
+    Z = Integer(z)
+    assert list(Z.iter_goldbach_partitions()) == expected
+    assert Z.count_goldbach_partitions() == len(expected)
+    assert Z.minimal_goldbach_partition() == \
+        (expected[0] if expected else None)
+
+
+def test_minimal_goldbach_partition_beyond_sieve_reach():
+    p, q = Integer(10**100).minimal_goldbach_partition()
+    assert p == 797 and p + q == 10**100 and is_prime(q)
+    # https://oeis.org/A025019, the first past the primes below 1000
+    assert Integer(37998938).minimal_goldbach_partition()[0] == 1039
+
+
+@settings(deadline=None)
+@given(st.integers(min_value=0, max_value=1e5),
+       st.integers(min_value=0, max_value=300),
+       st.integers(min_value=2, max_value=64))
+def test_verify_goldbach_block(lo, width, small_limit):
+    block = verify_goldbach_block(lo, lo + width, small_limit, record=True)
+    evens = range(lo + lo % 2, lo + width, 2)
+    minimal = block["minimal"]
+    assert len(minimal) == 2 * len(evens)
+    for i, n in enumerate(evens):
+        expected = next((p for p in range(2, n // 2 + 1)
+                         if is_prime(p) and is_prime(n - p)), 0)
+        assert int.from_bytes(minimal[2 * i:2 * i + 2], "little") == expected
+    assert block["checked"] == sum(block["counts"].values()) == \
+        len([n for n in evens if n >= 4])
+    assert block["counterexamples"] == []
+
+
+def test_verify_goldbach():
+    blocks = []
+    summary = verify_goldbach(0, 10**5, block_size=4096,
+                              on_block=blocks.append)
+    assert len(blocks) == 25
+    assert summary["checked"] == 10**5 // 2 - 2
+    # https://oeis.org/A025019
+    assert (summary["max_prime"], summary["max_at"]) == (293, 63274)
+    assert summary["counts"][2] == 1 and summary["counts"][3] > 0
+    assert summary["counterexamples"] == []
+    assert (verify_goldbach(3807000, 3808000)["max_prime"]) == 751
+
+
 @given(st.integers(max_value=1e4))
 def test_is_mersenne(z):
     if z <= 0:
@@ -318,6 +631,56 @@ def test_is_mersenne_prime(z):
             assert not Integer(z).is_mersenne_prime
 
 
+def test_lucas_lehmer():
+    # https://oeis.org/A000043
+    assert [p for p in range(1300) if lucas_lehmer(p)] == \
+        [2, 3, 5, 7, 13, 17, 19, 31, 61, 89, 107, 127, 521, 607, 1279]
+    assert Integer(2**2203 - 1).is_mersenne_prime
+    assert not Integer(2**2207 - 1).is_mersenne_prime
+    assert Integer(2**2207 - 1).is_mersenne
+    assert not Integer(2**2207).is_mersenne
+
+
+def test_mersenne_primes_and_perfect_numbers():
+    assert [m.bit_length() for m in it.islice(mersenne_primes(), 15)] == \
+        [2, 3, 5, 7, 13, 17, 19, 31, 61, 89, 107, 127, 521, 607, 1279]
+    perfect = list(it.islice(perfect_numbers(), 8))
+    assert perfect[:5] == [6, 28, 496, 8128, 33550336]
+    assert all(Integer(n).is_perfect for n in perfect[:6])
+    assert perfect[-1] == 2 ** 30 * (2 ** 31 - 1)
+
+
+def test_woodall_and_cullen_primes():
+    # https://oeis.org/A002234 and https://oeis.org/A005849
+    assert [k for k in range(1, 400) if is_prime(k * 2 ** k - 1)] == \
+        [integer._cullen_woodall_index(m + 1)
+         for m in it.takewhile(lambda m: m < 400 * 2 ** 400,
+                               woodall_primes())]
+    assert [integer._cullen_woodall_index(m + 1)
+            for m in it.islice(woodall_primes(), 15)] == \
+        [2, 3, 6, 30, 75, 81, 115, 123, 249, 362, 384, 462, 512, 751, 822]
+    assert list(it.islice(cullen_primes(), 2)) == [3, 141 * 2 ** 141 + 1]
+    assert all(Integer(m).is_woodall_prime
+               for m in it.islice(woodall_primes(), 8))
+    assert Integer(next(cullen_primes())).is_cullen_prime
+
+
+def test_special_prime_presieve():
+    # Only composites are sieved out, and the small primes that divide
+    # the candidates of other indices are kept when they are one
+    for sign in (1, -1):
+        kept = set(it.takewhile(
+            lambda k: k < 700, integer._cullen_woodall_candidates(sign, 1000)))
+        assert all(not is_prime((k << k) + sign)
+                   for k in set(range(1, 700)) - kept)
+        assert len(kept) < 100
+    exponents = list(it.takewhile(lambda p: p < 700,
+                                  integer._mersenne_exponents(1 << 16)))
+    primes = integer._primes_up_to(700)
+    assert set(exponents) < set(primes)
+    assert not any(lucas_lehmer(p) for p in set(primes) - set(exponents))
+
+
 @given(st.integers(max_value=1e4))
 def test_is_perfect(z):
     Z = Integer(z)
@@ -343,6 +706,16 @@ def test_is_squarefree(z):
             assert Z.is_squarefree
 
 
+@given(st.integers(max_value=1e4))
+def test_mobius(z):
+    Z = Integer(z)
+    if not Z.is_squarefree:
+        assert Z.mobius == 0
+    else:
+        assert Z.mobius == (-1) ** Z.omega
+        assert sum(Integer(d).mobius for d in Z.divisors | {z}) == (z == 1)
+
+
 @given(st.integers(max_value=1e4))
 def test_is_woodall(z):
     if z in {1, 7, 23, 63, 159, 383, 895, 2047, 4607}:
@@ -375,6 +748,41 @@ def test_is_cullen_prime(z):
         assert not Integer(z).is_cullen_prime
 
 
+@given(st.integers(min_value=2, max_value=3000), st.integers(-2, 2))
+def test_cullen_woodall_recognition(k, offset):
+    assert Integer(k * 2**k - 1 + offset).is_woodall == (offset == 0)
+    assert Integer(k * 2**k + 1 + offset).is_cullen == (offset == 0)
+
+
+def test_cullen_woodall_primes():
+    # https://oeis.org/A002234 and https://oeis.org/A005849
+    assert [k for k in range(1, 520)
+            if Integer(k * 2**k - 1).is_woodall_prime] == \
+        [2, 3, 6, 30, 75, 81, 115, 123, 249, 362, 384, 462, 512]
+    assert [k for k in range(1, 520)
+            if Integer(k * 2**k + 1).is_cullen_prime] == [1, 141]
+
+
+@given(st.integers(min_value=-10, max_value=1e6))
+def test_next_and_prev_prime(z):
+    after, before = next_prime(z), prev_prime(z)
+    assert after > z and is_prime(after)
+    assert not any(map(is_prime, range(z + 1, after)))
+    if z <= 2:
+        assert before is None
+    else:
+        assert before < z and is_prime(before)
+        assert not any(map(is_prime, range(before + 1, z)))
+
+
+def test_nearest_prime_of_large_numbers():
+    assert Integer(10**100).nearest_prime == (10**100 + 267,)
+    assert Integer(10**100 + 267).prev_prime == 10**100 - 797
+    # 10^100 - 797 and 10^100 + 267 are consecutive primes
+    assert Integer(10**100 - 265).nearest_prime == \
+        (10**100 - 797, 10**100 + 267)
+
+
 @given(st.integers(max_value=1e4))
 def test_nearest_prime(z):
     def generate_primes_before_n(n):
@@ -395,7 +803,7 @@ def test_nearest_prime(z):
             yield next(p)
 
     np = Integer(z).nearest_prime
-    if z <= 0:
+    if z <= 1:
         assert np == (2,)
     elif is_prime(z):
         assert np == (z,)
@@ -409,6 +817,69 @@ def test_nearest_prime(z):
                               key=lambda n, z=z: abs(z-n)),)
 
 
+def test_composite_numbers_against_divisor_counts():
+    limit = 10**5
+    tau = [0] * limit
+    for d in range(1, limit):
+        for m in range(d, limit, d):
+            tau[m] += 1
+    highly, largely, best = [], [], 0
+    for n in range(1, limit):
+        if tau[n] > best:
+            highly.append(n)
+        if tau[n] >= best:
+            largely.append(n)
+            best = tau[n]
+    assert list(it.islice(highly_composite_numbers(), len(highly))) == highly
+    assert list(it.islice(largely_composite_numbers(), len(largely))) \
+        == largely
+    assert next(n for n in highly_composite_numbers() if n >= limit) \
+        == 110880
+
+
+def test_highly_composite_numbers_shape():
+    # Non-increasing exponents over consecutive primes, divisor counts up
+    previous = 0
+    for n in it.islice(highly_composite_numbers(), 1, 300):
+        exponents = [e for _, e in sorted(Integer(n).decomposition.items())]
+        assert sorted(Integer(n).decomposition) == \
+            integer._primes_up_to(max(Integer(n).decomposition))
+        assert exponents == sorted(exponents, reverse=True)
+        assert Integer(n).tau > previous
+        previous = Integer(n).tau
+
+
+def test_superior_highly_composite_numbers():
+    assert list(it.islice(superior_highly_composite_numbers(), 12)) == [
+        2, 6, 12, 60, 120, 360, 2520, 5040, 55440, 720720, 1441440,
+        4324320]
+
+
+def test_nth_most_divisors():
+    assert [nth_most_divisors(n) for n in (1, 2, 3, 20, 40)] == [
+        1, 2, 4, 7560, 1441440]
+    with pt.raises(ValueError):
+        nth_most_divisors(0)
+
+
+def test_highly_composite_numbers_are_searched_once():
+    searches, records = [], integer._composite_records
+
+    def counted(**kwargs):
+        searches.append(kwargs)
+        return records(**kwargs)
+
+    with pt.MonkeyPatch.context() as mp:
+        mp.setattr(integer, "_highly_composite", [])
+        mp.setattr(integer, "_highly_composite_search", None)
+        mp.setattr(integer, "_composite_records", counted)
+        assert nth_most_divisors(40) == 1441440
+        assert nth_most_divisors(20) == 7560
+        assert list(it.islice(highly_composite_numbers(), 41))[39:] == \
+            [1441440, 2162160]
+        assert len(searches) == 1 and len(integer._highly_composite) == 41
+
+
 @given(st.integers(max_value=1e4))
 def test_Omega(z):
     assert Integer(z).Omega == sum(Integer(z).decomposition.values())
@@ -435,6 +906,97 @@ def test_pi(z):
     assert Integer(z).pi == sum(1 for x in range(2, z + 1) if is_prime(x))
 
 
+@settings(deadline=None)
+@given(st.integers(max_value=2e5))
+def test_prime_count_and_sum(z):
+    primes = [p for p in range(2, z + 1) if is_prime(p)]
+    assert prime_count(z) == len(primes)
+    assert prime_sum(z) == sum(primes)
+
+
+@pt.mark.parametrize("k, count", [(7, 664579), (8, 5761455),
+                                  (9, 50847534), (10, 455052511)])
+def test_prime_count_powers_of_ten(k, count):
+    assert prime_count(10**k) == count == Integer(10**k).pi
+
+
+@given(st.integers(min_value=-10, max_value=1e5))
+def test_factorize_with_spf_table(z):
+    expected = factorize(z)
+    set_spf_table_limit(10 ** 5 + 1)
+    try:
+        assert list(factorize(z).items()) == list(expected.items())
+    finally:
+        set_spf_table_limit(0)
+
+
+def test_spf_table():
+    ticks = iter([1.0, 3.5])
+    set_spf_table_limit(10 ** 4, clock=lambda: next(ticks))
+    try:
+        assert spf_table_stats() == {"limit": 10 ** 4, "built": False,
+                                     "bytes": 0, "build_seconds": None}
+        assert Integer(9978).decomposition == {2: 1, 3: 1, 1663: 1}
+        assert factorize(97 * 101) == {97: 1, 101: 1}
+        assert spf_table_stats() == {"limit": 10 ** 4, "built": True,
+                                     "bytes": 10 ** 4, "build_seconds": 2.5}
+        # Above the bound factorize goes its usual way
+        assert factorize(10007 * 3) == {3: 1, 10007: 1}
+    finally:
+        set_spf_table_limit(0)
+    assert not spf_table_stats()["built"]
+
+
+@settings(deadline=None)
+@given(st.integers(min_value=2, max_value=10**7),
+       st.sampled_from([2, 1 << 10, 1 << 18]))
+def test_lagarias_miller_odlyzko(n, segment_size):
+    previous, integer._LMO_SEGMENT_SIZE = \
+        integer._LMO_SEGMENT_SIZE, segment_size
+    try:
+        assert integer._lagarias_miller_odlyzko(n) == \
+            integer._lucy_hedgehog(n)
+    finally:
+        integer._LMO_SEGMENT_SIZE = previous
+
+
+def test_prime_count_without_table():
+    set_pi_table_limit(100)
+    try:
+        assert prime_count(10**6) == 78498
+        assert prime_count(97) == 25
+    finally:
+        set_pi_table_limit(1 << 20)
+
+
+@given(st.integers(min_value=-10, max_value=1e5),
+       st.integers(min_value=0, max_value=2000),
+       st.integers(min_value=2, max_value=300),
+       st.integers(min_value=1, max_value=4))
+def test_sieve_segments(lo, width, segment_size, tasks_per_round):
+    hi = lo + width
+    expected = [p for p in range(lo, hi) if is_prime(p)]
+    assert list(sieve_primes(lo, hi, segment_size,
+                             tasks_per_round=tasks_per_round)) == expected
+
+    segments = list(sieve_segments(lo, hi, segment_size, mapper=shuffled,
+                                   tasks_per_round=tasks_per_round,
+                                   summary=True))
+    assert [start for start, _, _ in segments] == \
+        list(range(max(lo, 0), hi, segment_size))
+    assert all(end - start <= segment_size for start, end, _ in segments)
+    assert sum(count for _, _, (count, _) in segments) == len(expected)
+    assert sum(total for _, _, (_, total) in segments) == sum(expected)
+
+
+def test_sieve_segments_rejects_empty_rounds():
+    for tasks_per_round in (0, -1):
+        with pt.raises(ValueError):
+            list(sieve_segments(0, 100, tasks_per_round=tasks_per_round))
+        with pt.raises(ValueError):
+            list(sieve_primes(0, 100, tasks_per_round=tasks_per_round))
+
+
 @given(st.integers(max_value=1e4))
 def test_primality(z):
     if is_prime(z):
@@ -447,7 +1009,18 @@ def test_primality(z):
 def test_sigma(z):
     Z = Integer(z)
     assert Z.sigma == sum(it.filterfalse(lambda x: z % x,
-                                         range(1, z//2 + 1)))
+                                         range(1, z + 1)))
+
+
+@given(st.integers(max_value=1e4), st.integers(min_value=0, max_value=4))
+def test_sigma_k(z, k):
+    assert Integer(z).sigma_k(k) == sum(d**k for d in range(1, z + 1)
+                                        if z % d == 0)
+
+
+def test_sigma_k_negative_raises_value_error():
+    with pt.raises(ValueError):
+        Integer(12).sigma_k(-1)
 
 
 @given(st.integers(max_value=1e4))
@@ -470,3 +1043,169 @@ def test_totatives(z):
     else:
         assert Integer(z).totatives == {x for x in range(1, z + 1)
                                         if Integer.gcd(z, x) == 1}
+
+
+@given(st.integers(max_value=1e6))
+def test_invariants_share_one_factorization(z):
+    integer.invariant_cache.clear()
+    with pt.MonkeyPatch.context() as mp:
+        calls = count_factorize_calls(mp)
+        Z = Integer(z)
+        profile = Z.profile()
+        for name in ("tau", "Omega", "omega", "radical", "is_squarefree",
+                     "factorization", "decomposition"):
+            assert getattr(Z, name) == profile[name]
+    assert len(calls) == (1 if z >= 2 else 0)
+
+
+def test_integer_is_compact():
+    Z = Integer(10 ** 20)
+    assert not hasattr(Z, "__dict__")
+    assert type(Z.num) is int and Z.num == 10 ** 20
+    with pt.raises(AttributeError):
+        Z.num = 1
+    with pt.raises(AttributeError):
+        Z.tau = 1
+
+
+def test_equal_integers_share_invariants():
+    integer.invariant_cache.clear()
+    with pt.MonkeyPatch.context() as mp:
+        calls = count_factorize_calls(mp)
+        assert Integer(720).tau == Integer("720").tau == (Integer(24) * 30).tau
+    assert calls == [720]
+    assert type(Integer(6) * 7) is Integer and type(Integer(6) * 0.5) is float
+
+
+def test_instrumentation():
+    integer.invariant_cache.clear()
+    factorization_cache.clear()
+    ticks = it.count()
+    assert not instrumentation.enabled
+    with instrumentation.collect(lambda: next(ticks)) as outer:
+        n = (2 ** 31 - 1) * (2 ** 61 - 1)
+        assert Integer(n).tau == Integer(n).tau == 4
+        assert Integer(n).decomposition == {2 ** 31 - 1: 1, 2 ** 61 - 1: 1}
+        with instrumentation.collect() as inner:
+            assert factorize(n) == {2 ** 31 - 1: 1, 2 ** 61 - 1: 1}
+            assert is_prime(97)
+        assert integer.factorize(2 ** 40) == {2: 40}
+    assert not instrumentation.enabled
+    counts = inner.stats["counts"]
+    assert counts["factorize"] == counts["factorize.cached"] == 1
+    assert counts["is_prime"] == 1 and inner.stats["seconds"] == {}
+    assert inner.stats["caches"]["factorization"]["hits"] == 1
+    counts = outer.stats["counts"]
+    assert counts["factorize"] == 3 and counts["factorize.rho"] == 1
+    assert counts["computed.tau"] == counts["computed._factors"] == 1
+    assert counts["cached.tau"] == 1 and counts["gcd"] > 0
+    # All the trial division primes for n, then only 2 for 2 ** 40: the loop
+    # stops at 3 on p * p > n without dividing
+    assert counts["trial_divisions"] == len(integer._TRIAL_DIVISION_PRIMES) + 1
+    assert counts["is_prime"] > inner.stats["counts"]["is_prime"]
+    assert outer.stats["seconds"]["tau"] > outer.stats["seconds"]["_factors"]
+    assert outer.stats["seconds"]["decomposition"] > 0
+    assert outer.stats["caches"]["factorization"]["misses"] == 2
+    # The prime gap search tests its candidates past 1000^2 as well
+    with instrumentation.collect() as scope:
+        assert next_prime(10 ** 12) == 10 ** 12 + 39
+    assert scope.stats["counts"]["is_prime"] > 0
+    # Off, nothing is counted
+    factorize(10 ** 6 + 3)
+    assert instrumentation.stats()["counts"] == {}
+
+    instrumentation.enable()
+    try:
+        Integer(10 ** 6).sigma
+        assert instrumentation.stats()["counts"]["computed.sigma"] == 1
+        instrumentation.reset()
+        stats = instrumentation.stats()
+        assert stats["enabled"] and stats["counts"] == {}
+        assert stats["caches"]["invariant"]["hits"] == 0
+    finally:
+        assert instrumentation.disable()["enabled"]
+
+
+def test_instrumentation_profile_hook():
+    factorization_cache.clear()
+    ticks = it.count()
+    with instrumentation.collect(lambda: next(ticks)) as scope:
+        sys.setprofile(instrumentation.profile_hook)
+        try:
+            factorize(1000003 * (2 ** 61 - 1))
+        finally:
+            sys.setprofile(None)
+    counts, seconds = scope.stats["counts"], scope.stats["seconds"]
+    assert counts["calls.factorize"] == counts["factorize"] == 1
+    assert counts["calls.is_prime"] == counts["is_prime"] > 0
+    assert "calls._tally" not in counts
+    assert seconds["calls.factorize"] > seconds["calls._split"] > 0
+
+
+def test_instrumentation_profile_hook_nested_without_clock():
+    # sieve_segments is resumed under the clocked scope and yields under
+    # the inner one, which has no clock
+    ticks, inner = it.count(), instrumentation.collect()
+
+    def mapper(function, tasks):
+        inner.__enter__()
+        return map(function, tasks)
+
+    with instrumentation.collect(lambda: next(ticks)) as outer:
+        sys.setprofile(instrumentation.profile_hook)
+        try:
+            assert len(list(sieve_primes(0, 1000, mapper=mapper))) == 168
+        finally:
+            sys.setprofile(None)
+            inner.__exit__(None, None, None)
+    assert inner.stats["counts"]["calls._sieve_task"] == 1
+    assert inner.stats["seconds"] == {}
+    assert outer.stats["counts"]["calls.sieve_segments"] > 0
+    assert outer.stats["seconds"]["calls._sieve_base_primes"] > 0
+
+
+def test_decomposition_is_a_copy():
+    Z = Integer(12)
+    Z.decomposition[2] = 5
+    assert Z.decomposition == {2: 2, 3: 1}
+
+
+@given(st.integers(max_value=1e4), st.integers(min_value=1, max_value=100))
+def test_iter_totatives(z, block_size):
+    expected = [x for x in range(1, z + 1) if math.gcd(z, x) == 1]
+    assert list(Integer(z).iter_totatives(block_size)) == expected
+
+
+@given(st.integers(max_value=1e4))
+def test_totative_mask(z):
+    mask = Integer(z).totative_mask()
+    assert len(mask) == (z // 8 + 1 if z > 0 else 0)
+    assert [k for k in range(8 * len(mask)) if mask[k >> 3] >> (k & 7) & 1] \
+        == sorted(Integer(z).totatives)
+
+
+@given(st.integers(min_value=-100, max_value=1e6),
+       st.integers(min_value=0, max_value=300),
+       st.integers(min_value=1, max_value=100))
+def test_integer_range(start, width, segment_size):
+    columns = IntegerRange(start, start + width, segment_size).columns()
+    assert set(columns) == set(IntegerRange.COLUMNS)
+    for name, column in columns.items():
+        assert list(column) == [getattr(Integer(n), name)
+                                for n in range(start, start + width)]
+
+
+def test_integer_range_segments():
+    r = IntegerRange(-5, 10 ** 12 + 7, segment_size=4)
+    segments = r.segments(("tau", "mobius"))
+    assert next(segments) == (-5, -1, {"tau": [0] * 4, "mobius": [0] * 4})
+    assert next(segments)[:2] == (-1, 1)
+    lo, hi, columns = next(segments)
+    assert (lo, hi, columns["tau"], columns["mobius"]) == \
+        (1, 5, [1, 2, 2, 3], [1, -1, -1, 0])
+    # Beyond the sieve limit the cofactors left get factorized
+    n = (2 ** 31 - 1) * (2 ** 61 - 1)
+    assert IntegerRange(n, n + 1).column("sigma") == [2 ** 31 * 2 ** 61]
+    assert IntegerRange(3, 3).columns("omega") == {"omega": bytearray()}
+    with pt.raises(ValueError):
+        IntegerRange(1, 10).column("radical")
@@ -0,0 +1,79 @@
+import itertools as it
+
+import pytest as pt
+
+import integer
+import parallel
+
+
+def test_siqs():
+    p, q = 100000000000000000039, 1000000000000000000117
+    assert parallel.siqs(p * q, processes=2) in (p, q)
+
+
+def test_factorize():
+    assert parallel.factorize(2**3 * 100000000000000000039 *
+                              1000000000000000000117, processes=2) == \
+        {2: 3, 100000000000000000039: 1, 1000000000000000000117: 1}
+
+
+def test_verify_goldbach():
+    summary = parallel.verify_goldbach(0, 10**6, processes=2)
+    assert summary["checked"] == 10**6 // 2 - 2
+    assert (summary["max_prime"], summary["max_at"]) == (523, 503222)
+    assert summary["counterexamples"] == []
+
+
+def test_sieve_segments():
+    segments = list(parallel.sieve_segments(0, 10**6, processes=2,
+                                            segment_size=1 << 16,
+                                            summary=True))
+    assert [lo for lo, _, _ in segments] == list(range(0, 10**6, 1 << 16))
+    assert sum(count for _, _, (count, _) in segments) == 78498
+    assert sum(total for _, _, (_, total) in segments) == 37550402023
+    assert list(parallel.sieve_primes(10**6, 10**6 + 100, processes=2,
+                                      segment_size=16)) == \
+        [1000003, 1000033, 1000037, 1000039, 1000081, 1000099]
+
+
+def test_factor_many():
+    values = list(range(-3, 3000)) + [2**67 - 1, 10**20 + 39, 12]
+    expected = [(n, integer.Integer(n).decomposition) for n in values]
+    assert list(parallel.factor_many(values, processes=2,
+                                     chunk_size=64)) == expected
+    results = list(parallel.factor_many(values, processes=2, chunk_size=64,
+                                        ordered=False))
+    assert sorted(results, key=repr) == sorted(expected, key=repr)
+
+
+def test_factor_many_back_pressure():
+    consumed = []
+
+    def numbers():
+        for n in it.count(2):
+            consumed.append(n)
+            yield n
+
+    results = parallel.factor_many(numbers(), processes=2, chunk_size=10,
+                                   max_pending=50)
+    assert list(it.islice(results, 5)) == \
+        [(2, {2: 1}), (3, {3: 1}), (4, {2: 2}), (5, {5: 1}), (6, {2: 1, 3: 1})]
+    # At most max_pending numbers plus the task being formed get pulled
+    assert len(consumed) <= 5 + 50 + 10
+    results.close()
+    for max_pending in (0, -1):
+        with pt.raises(ValueError):
+            list(parallel.factor_many([12, 18], processes=2,
+                                      max_pending=max_pending))
+
+
+def test_special_primes():
+    assert [m.bit_length() for m in it.islice(
+        parallel.mersenne_primes(processes=2), 12)] == \
+        [2, 3, 5, 7, 13, 17, 19, 31, 61, 89, 107, 127]
+    assert list(it.islice(parallel.woodall_primes(processes=2), 5)) == \
+        [k * 2 ** k - 1 for k in (2, 3, 6, 30, 75)]
+    assert list(it.islice(parallel.cullen_primes(processes=3), 2)) == \
+        [3, 141 * 2 ** 141 + 1]
+    assert list(it.islice(parallel.perfect_numbers(processes=2), 4)) == \
+        [6, 28, 496, 8128]
@@ -0,0 +1,93 @@
+import itertools as it
+
+from hypothesis import given, strategies as st
+import pytest as pt
+
+import integer
+import parallel
+import primetable
+
+LIMIT = 100003
+
+
+@pt.fixture(scope="module")
+def table_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("primes") / "primes.bin")
+    # Small segments, so the table is written over several of them
+    assert primetable.build(path, LIMIT, segment_size=1 << 14) == 9593
+    return path
+
+
+@pt.fixture
+def table(table_path):
+    with primetable.PrimeTable(table_path) as table:
+        yield table
+
+
+def test_build_and_read(table):
+    assert (table.limit, table.count) == (LIMIT, 9593)
+    assert table.primes(0, LIMIT + 1) == integer._primes_up_to(LIMIT)
+    assert table.pi(LIMIT) == 9593 and table.pi(LIMIT - 1) == 9592
+    assert [table.pi(n) for n in range(-1, 12)] == \
+        [0, 0, 0, 1, 2, 2, 3, 3, 4, 4, 4, 4, 5]
+
+
+@given(st.integers(min_value=-10, max_value=LIMIT),
+       st.integers(min_value=0, max_value=3000))
+def test_table_queries(table_path, lo, width):
+    hi = min(lo + width, LIMIT + 1)
+    with primetable.PrimeTable(table_path, verify=False) as table:
+        assert table.primes(lo, hi) == \
+            [p for p in range(lo, hi) if integer.is_prime(p)]
+        n = max(hi - 1, 0)
+        assert table.is_prime(n) == integer.is_prime(n)
+        assert table.pi(n) == integer.prime_count(n)
+
+
+def test_integer_consults_loaded_table(table_path):
+    calls = []
+    table = primetable.load(table_path)
+    try:
+        for name in ("is_prime", "pi", "primes"):
+            method = getattr(table, name)
+            setattr(table, name, lambda *args, method=method, name=name:
+                    calls.append(name) or method(*args))
+        assert integer.is_prime(99991) and not integer.is_prime(99993)
+        assert integer.prime_count(LIMIT) == 9593
+        assert list(it.islice(integer.generate_primes(99980, 16), 3)) == \
+            [99989, 99991, 100003]
+        # Beyond the table the usual algorithms take over
+        assert integer.is_prime(100019) and integer.prime_count(10 ** 6) \
+            == 78498
+        assert sorted(set(calls)) == ["is_prime", "pi", "primes"]
+        assert primetable.current() is table
+        assert parallel.factorize(99991 * 100019, processes=2) == \
+            {99991: 1, 100019: 1}
+    finally:
+        primetable.unload()
+    assert primetable.current() is None
+    assert integer.use_prime_table(None) is None
+
+
+def test_corrupt_tables_are_rejected(table_path, tmp_path):
+    with open(table_path, "rb") as handle:
+        data = handle.read()
+    cases = {"magic": b"NOTPRIME" + data[8:],
+             "version": data[:8] + b"\x02" + data[9:],
+             "block size": data[:12] + bytes(4) + data[16:],
+             "truncated": data[:-8],
+             "checksum": data[:1000] + bytes([data[1000] ^ 1]) + data[1001:],
+             "short": data[:10]}
+    for name, corrupt in cases.items():
+        path = tmp_path / name
+        path.write_bytes(corrupt)
+        with pt.raises(ValueError):
+            primetable.PrimeTable(str(path))
+    # Only the checksum notices a flipped bit, and only when asked to
+    with primetable.PrimeTable(str(tmp_path / "checksum"), verify=False):
+        pass
+
+
+def test_build_needs_a_prime():
+    with pt.raises(ValueError):
+        primetable.build("unused.bin", 1)